@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from econ_math_portfolio import __version__
+from econ_math_portfolio.tasks import TASKS
+from econ_math_portfolio.utils.optional import numpy_or_none
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    seconds: float  # best observed time per call
+    number: int
+    repeat: int
+
+
+@dataclass(frozen=True)
+class _Case:
+    name: str
+    fn: Callable[[], object]
+    number: int
+    repeat: int = 5
+
+
+def _import_cold(module: str, cwd: Path) -> Callable[[], object]:
+    # A fresh interpreter per run: the models, solvers, cache and NumPy that the validator
+    # pulls in are imported from scratch, as in a real first import (interpreter startup is
+    # included, as in ``cli_startup``).
+    cmd = [sys.executable, "-c", f"import {module}"]
+    return lambda: subprocess.run(cmd, check=True, capture_output=True, cwd=cwd)
+
+
+def _cases(quick: bool) -> List[_Case]:
+    from econ_math_portfolio.models.contract_stochastic_income import (
+        ContractParams,
+        solve_c_high,
+    )
+    from econ_math_portfolio.models.cpi_target_discount import CpiParams, solve_t
+    from econ_math_portfolio.models.credit_tail import tail_curve
+    from econ_math_portfolio.models.credit_var_quantile import (
+        CreditParams,
+        var_mc,
+        var_mc_adaptive,
+    )
+    from econ_math_portfolio.models.hjb_discount_threshold import HjbParams, rho_critical
+    from econ_math_portfolio.scoring import load_compiled_rubric, score_submission
+
+    cp, tp, kp, hp = ContractParams(), CpiParams(), CreditParams(), HjbParams()
+    scale = 10 if quick else 1
+    cases: List[_Case] = []
+
+    for n in (10_000, 50_000, 200_000):
+        n //= scale
+        cases.append(_Case(f"var_mc[python,n={n}]", lambda n=n: var_mc(kp, n_paths=n), 1, 3))
+    if numpy_or_none() is not None:
+        for n in (1_000_000, 10_000_000):
+            n //= scale
+            cases.append(
+                _Case(
+                    f"var_mc[numpy,n={n}]",
+                    lambda n=n: var_mc(kp, n_paths=n, backend="numpy", streaming=True),
+                    1,
+                    3,
+                )
+            )
+
+    width = 1.0 * scale**0.5  # ~ 1/sqrt(paths): quick mode stops after ~1/10 of the paths
+    cases.append(
+        _Case(
+            f"var_mc_adaptive[width={width:.2f}]",
+            lambda width=width: var_mc_adaptive(kp, target_width=width),
+            1,
+            3,
+        )
+    )
+    n = 50_000 // scale
+    cases.append(_Case(f"tail_curve[3 alphas,n={n}]", lambda n=n: tail_curve(kp, n_paths=n), 1, 3))
+
+    for method in ("closed_form", "newton", "brent", "bisect"):
+        cases.append(
+            _Case(f"solve_c_high[{method}]", lambda m=method: solve_c_high(cp, method=m), 1000)
+        )
+        cases.append(_Case(f"solve_t[{method}]", lambda m=method: solve_t(tp, method=m), 1000))
+    cases.append(_Case("rho_critical", lambda: rho_critical(hp), 1000))
+
+    root = Path(__file__).resolve().parents[2]
+    for task in TASKS.values():
+        cases.append(_Case(f"validator_import[{task.task_id}]", _import_cold(task.module, root), 1))
+
+    rubric_path = root / "rubrics" / "rubric.json"
+    rubric = load_compiled_rubric(rubric_path)
+    cases.append(
+        _Case(
+            "score_submission",
+            lambda: score_submission(
+                task_id="cpi_target_discount",
+                answer=0.26,
+                explanation="linear CPI in t, solve for the discount that hits the target",
+                expected=0.2619047619047619,
+                rubric=rubric,
+            ),
+            10_000,
+        )
+    )
+    np = numpy_or_none()
+    if np is not None:
+        from econ_math_portfolio.columnar import score_columns
+
+        n = 1_000_000 // scale
+        rng = np.random.default_rng(0)
+        ids = np.array(sorted(TASKS))[rng.integers(0, len(TASKS), n)]
+        answers, words = rng.random(n), rng.integers(0, 12, n)
+        cases.append(
+            _Case(
+                f"score_columns[n={n}]",
+                lambda: score_columns(
+                    ids, answers, words, rubric=rubric, expected_for=lambda _: 0.5
+                ),
+                1,
+                3,
+            )
+        )
+    for argv in (["list"], ["validate", "cpi_target_discount", "0.2619047619"]):
+        cmd = [sys.executable, "-m", "econ_math_portfolio", *argv]
+        cases.append(
+            _Case(
+                f"cli_startup[{argv[0]}]",
+                lambda cmd=cmd: subprocess.run(cmd, check=True, capture_output=True),
+                1,
+            )
+        )
+    return cases
+
+
+def run_benchmarks(*, quick: bool = False, select: Optional[str] = None) -> List[BenchResult]:
+    """Time every benchmark case (best of ``repeat`` runs of ``number`` calls each)."""
+    results = []
+    for case in _cases(quick):
+        if select and select not in case.name:
+            continue
+        case.fn()  # warm-up: imports, memoized lookups
+        best = min(timeit.repeat(case.fn, number=case.number, repeat=case.repeat))
+        results.append(BenchResult(case.name, best / case.number, case.number, case.repeat))
+    return results
+
+
+def to_json_dict(results: List[BenchResult]) -> Dict[str, object]:
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "results": {r.name: r.seconds for r in results},
+    }
+
+
+def load_baseline(path: Path) -> Dict[str, float]:
+    return {k: float(v) for k, v in json.loads(path.read_text(encoding="utf-8"))["results"].items()}
+
+
+def find_regressions(
+    results: List[BenchResult], baseline: Dict[str, float], *, threshold: float = 0.25
+) -> List[Dict[str, float | str]]:
+    """Cases slower than ``baseline * (1 + threshold)``; cases missing from the baseline pass."""
+    out: List[Dict[str, float | str]] = []
+    for r in results:
+        base = baseline.get(r.name)
+        if base is not None and base > 0 and r.seconds > base * (1.0 + threshold):
+            out.append({"name": r.name, "seconds": r.seconds, "baseline": base})
+    return out
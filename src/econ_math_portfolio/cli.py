@@ -2,32 +2,48 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import sys
 from importlib import import_module
-from pathlib import Path
-from typing import Any
 
-from econ_math_portfolio.scoring import (
-    load_rubric,
-    load_submission_json,
-    score_submission,
-    to_json_dict,
-)
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.tasks import get_task, split_key, task_ids
 
+# The CLI is run from shell loops, so startup matters: only the task and metrics registries
+# are imported eagerly (not even pathlib or typing). Scoring, caching, solvers and the process
+# pool are imported inside the commands that need them.
 
-def _repo_root() -> Path:
-    return Path(__file__).resolve().parents[2]
 
+def _repo_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 
-def _validators_dir() -> Path:
-    return _repo_root() / "validators"
+
+def _rubric_path() -> str:
+    return os.path.join(_repo_root(), "rubrics", "rubric.json")
+
+
+# Set by ``--metrics``: batch and streaming commands (whose stdout is one record per input)
+# write their aggregate timers/counters to stderr. ``--json`` output always has them.
+_REPORT_METRICS = False
+# Set by ``--variants``: the variant manifest, also handed to batch workers.
+_MANIFEST: str | None = None
 
 
 def _load_validator(task_id: str):
-    return import_module(f"validators.{task_id}")
+    with METRICS.phase("validator_import"):
+        return import_module(get_task(task_id).module)
+
+
+def _expected(key: str) -> float:
+    # ``key`` is a task id or a variant id (``scoring.reference_key``).
+    task_id, variant = split_key(key)
+    return float(_load_validator(task_id).expected(variant))
 
 
-def _emit(obj: Any, *, as_json: bool) -> None:
+def _emit(obj: object, *, as_json: bool) -> None:
     if as_json:
+        if isinstance(obj, dict):
+            obj = {**obj, "metrics": METRICS.snapshot()}
         print(json.dumps(obj, indent=2, sort_keys=True))
     else:
         if isinstance(obj, dict):
@@ -37,48 +53,432 @@ def _emit(obj: Any, *, as_json: bool) -> None:
 
 
 def cmd_list(*, as_json: bool) -> int:
-    tasks = sorted([p.stem for p in _validators_dir().glob("*.py") if p.name != "__init__.py"])
-    _emit({"tasks": tasks}, as_json=as_json)
+    _emit({"tasks": task_ids()}, as_json=as_json)
     return 0
 
 
-def cmd_reference(task_id: str, *, as_json: bool) -> int:
+def cmd_reference(task_id: str, *, variant: str | None = None, as_json: bool) -> int:
     v = _load_validator(task_id)
-    value = float(v.reference_compute())
-    _emit({"task_id": task_id, "reference": value}, as_json=as_json)
+    value = float(v.expected(variant))
+    out = {"task_id": task_id, "reference": value}
+    if variant is not None:
+        out["variant"] = variant
+    _emit(out, as_json=as_json)
     return 0
 
 
-def cmd_validate(task_id: str, answer: float, *, as_json: bool) -> int:
+def cmd_validate(task_id: str, answer: float, *, variant: str | None = None, as_json: bool) -> int:
     v = _load_validator(task_id)
-    res = v.validate(answer)
+    with METRICS.phase("validate"):
+        res = v.validate(answer, variant)
     _emit(res, as_json=as_json)
     return 0 if res["ok"] else 2
 
 
+# Answers per ``validate_many`` call in ``validate --answers``; results are written per block.
+_ANSWER_BLOCK = 1 << 16
+
+
+def _parse_answer(token: str) -> float | None:
+    # Non-finite values are rejected too: the output must stay strict JSON (no NaN/Infinity).
+    try:
+        value = float(token)
+    except ValueError:
+        return None
+    return value if value - value == 0.0 else None
+
+
+def _answer_lines(start: int, answers: list, ok: list, err: list) -> str:
+    out = []
+    checked = iter(zip(ok, err, strict=True))
+    for i, a in enumerate(answers, start):
+        if a is None:
+            rec = {"index": i, "answer": None, "ok": False, "error": "answer is not a number"}
+        else:
+            o, e = next(checked)
+            rec = {"index": i, "answer": a, "ok": o, "abs_error": e}
+        out.append(json.dumps(rec, allow_nan=False) + "\n")
+    return "".join(out)
+
+
+def cmd_validate_many(
+    task_id: str, answers_path: str, *, variant: str | None = None, block: int = _ANSWER_BLOCK
+) -> int:
+    """Validate whitespace-separated answers (a file or stdin) against one task, streaming one
+    ``{"index", "answer", "ok", "abs_error"}`` line per answer; a summary goes to stderr.
+
+    A token that is not a finite number gets ``{"answer": null, "ok": false, "error": ...}``,
+    as in ``validate-batch``."""
+    from itertools import chain, islice
+
+    v = _load_validator(task_id)
+    expected = float(v.expected(variant))  # looked up once; ``validate_many`` reuses it
+    stream = sys.stdin if answers_path == "-" else open(answers_path, encoding="utf-8")
+    n = n_ok = 0
+    try:
+        tokens = chain.from_iterable(line.split() for line in stream)
+        while True:
+            answers = [_parse_answer(t) for t in islice(tokens, block)]
+            if not answers:
+                break
+            with METRICS.phase("validate"):
+                res = v.validate_many([a for a in answers if a is not None], variant)
+            ok, err = res.ok, res.abs_error
+            if not isinstance(ok, list):
+                ok, err = ok.tolist(), err.tolist()
+            sys.stdout.write(_answer_lines(n, answers, ok, err))
+            n += len(answers)
+            n_ok += res.n_ok
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    summary = {"task_id": task_id, "expected": expected, "count": n, "ok": n_ok}
+    if variant is not None:
+        summary["variant"] = variant
+    if _REPORT_METRICS:
+        summary["metrics"] = METRICS.snapshot()
+    sys.stderr.write(json.dumps(summary, sort_keys=True) + "\n")
+    return 0 if n_ok == n else 2
+
+
 def cmd_score(submission_path: str, *, as_json: bool) -> int:
+    from pathlib import Path
+
+    from econ_math_portfolio.scoring import load_compiled_rubric, load_submission_json, score_many
+
     sub_path = Path(submission_path)
-    payload = load_submission_json(sub_path)
-    task_id = str(payload.get("task_id", "")).strip()
-    answer = payload.get("answer", None)
-    explanation = payload.get("explanation", None)
+    with METRICS.phase("json_parse"):
+        payload = load_submission_json(sub_path)
+    with METRICS.phase("rubric_load"):
+        rubric = load_compiled_rubric(Path(_rubric_path()))
 
-    v = _load_validator(task_id)
-    expected = float(v.EXPECTED)
+    # A ``variant`` field in the submission selects that variant's reference.
+    res = next(score_many([payload], rubric=rubric, expected_for=_expected))
+    out = {"task_id": res["task_id"], "score": res["score"]}
+    _emit(out, as_json=as_json)
+    return 0 if res["score"]["total"] >= 0.8 else 2
+
+
+# Per-process state for batch workers: the compiled rubric is shipped once per worker.
+_WORKER: dict[str, object] = {}
 
-    rubric_path = _repo_root() / "rubrics" / "rubric.json"
-    rubric = load_rubric(rubric_path)
 
-    sb = score_submission(
-        task_id=task_id,
-        answer=answer,
-        explanation=explanation if isinstance(explanation, str) else None,
-        expected=expected,
-        rubric=rubric,
+def _init_batch_worker(
+    rubric: object,
+    use_cache: bool,
+    verify: bool,
+    store_path: str | None = None,
+    group_by: str | None = None,
+    manifest: str | None = None,
+) -> None:
+    from econ_math_portfolio import cache, solvers
+
+    cache.set_enabled(use_cache)
+    solvers.set_verify(verify)
+    if manifest is not None:
+        from econ_math_portfolio import variants
+
+        variants.set_manifest(manifest)
+    _WORKER["rubric"] = rubric
+    _WORKER["group_by"] = group_by
+    if store_path is not None:
+        from econ_math_portfolio.store import ResultStore
+
+        _WORKER["store"] = ResultStore(store_path)
+
+
+def _score_chunk(chunk: tuple[int, list[object]]) -> dict:
+    from econ_math_portfolio.scoring import score_many
+
+    start, payloads = chunk
+    rubric = _WORKER["rubric"]
+    store = _WORKER.get("store")
+    if store is None:
+        results = list(score_many(payloads, rubric=rubric, expected_for=_expected, start=start))
+    else:
+        from econ_math_portfolio.store import score_many_stored
+
+        results = list(
+            score_many_stored(
+                payloads, rubric=rubric, expected_for=_expected, store=store, start=start
+            )
+        )
+    group_by = _WORKER.get("group_by")
+    if group_by:
+        # Carry the grouping field into the output so ``summarize`` can group on it later.
+        for res, payload in zip(results, payloads, strict=True):
+            res[group_by] = payload.get(group_by) if isinstance(payload, dict) else None
+    return {"results": results, "metrics": METRICS.drain()}
+
+
+def _validate_chunk(chunk: tuple[int, list[object]]) -> dict:
+    from econ_math_portfolio.scoring import validate_record
+
+    start, payloads = chunk
+    results = [{"index": i, **validate_record(p, _expected)} for i, p in enumerate(payloads, start)]
+    return {"results": results, "metrics": METRICS.drain()}
+
+
+def _run_batch(
+    worker_fn,
+    input_path: str,
+    *,
+    workers: int,
+    chunk_size: int,
+    store: str | None = None,
+    group_by: str | None = None,
+    summary_path: str | None = None,
+) -> int:
+    from pathlib import Path
+
+    from econ_math_portfolio import cache, solvers
+    from econ_math_portfolio.metrics import Metrics
+    from econ_math_portfolio.parallel import chunked, imap_ordered
+    from econ_math_portfolio.scoring import compile_rubric, iter_submissions, load_rubric
+
+    # Compiled (and schema-checked) before any input is read: a bad rubric fails up front.
+    with METRICS.phase("rubric_load"):
+        raw_rubric = load_rubric(Path(_rubric_path()))
+        rubric = compile_rubric(raw_rubric)
+    stream = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+    init_args = (rubric, cache.is_enabled(), solvers.verify_enabled(), store, group_by, _MANIFEST)
+    summary = None
+    if summary_path is not None:
+        from econ_math_portfolio.summary import Summary
+
+        summary = Summary(group_by)
+    try:
+        results = imap_ordered(
+            worker_fn,
+            chunked(iter_submissions(stream), chunk_size),
+            workers=workers,
+            initializer=_init_batch_worker,
+            initargs=init_args,
+        )
+        # Worker deltas are summed here; in-process runs drain the same global registry.
+        worker_metrics = Metrics()
+        for chunk in results:
+            for res in chunk["results"]:
+                sys.stdout.write(json.dumps(res, sort_keys=True, allow_nan=False) + "\n")
+                if summary is not None:
+                    summary.add(res)
+            worker_metrics.merge(chunk["metrics"])
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        worker_store = _WORKER.pop("store", None)  # in-process run (workers <= 1)
+        if worker_store is not None:
+            worker_store.close()
+    if store is not None:
+        from econ_math_portfolio.store import ResultStore
+
+        with ResultStore(store) as s:
+            s.record_rubric(raw_rubric)  # baseline for a later ``rescore``
+    if summary is not None:
+        _write_summary(summary.to_json_dict(), summary_path)
+    METRICS.merge(worker_metrics.snapshot())
+    if _REPORT_METRICS:
+        # stdout stays one record per input line; the aggregate goes to stderr.
+        sys.stderr.write(json.dumps({"metrics": METRICS.snapshot()}, sort_keys=True) + "\n")
+    return 0
+
+
+def _write_summary(report: dict, path: str) -> None:
+    text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if path == "-":
+        sys.stderr.write(text)
+    else:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+
+
+_RESULT_KEYS = ("index", "task_id", "score")
+
+
+def cmd_score_batch(
+    input_path: str,
+    *,
+    workers: int = 1,
+    chunk_size: int = 256,
+    store: str | None = None,
+    group_by: str | None = None,
+    summary: str | None = None,
+) -> int:
+    if group_by in _RESULT_KEYS:
+        sys.stderr.write(f"score-batch: --group-by {group_by!r} clashes with a result key\n")
+        return 1
+    return _run_batch(
+        _score_chunk,
+        input_path,
+        workers=workers,
+        chunk_size=chunk_size,
+        store=store,
+        group_by=group_by,
+        summary_path=summary,
     )
-    out = {"task_id": task_id, "score": to_json_dict(sb)}
+
+
+def cmd_summarize(input_path: str, *, group_by: str | None, top: int | None) -> int:
+    from econ_math_portfolio.scoring import iter_submissions
+    from econ_math_portfolio.summary import Summary
+
+    summary = Summary(group_by)
+    stream = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+    try:
+        for record in iter_submissions(stream):
+            if isinstance(record, dict):
+                summary.add(record)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    # the same report ``--summary`` writes, so no run metrics
+    sys.stdout.write(json.dumps(summary.to_json_dict(top=top), indent=2, sort_keys=True) + "\n")
+    return 0
+
+
+def cmd_rescore(input_path: str, *, store: str, since_rubric: str | None) -> int:
+    from pathlib import Path
+
+    from econ_math_portfolio.scoring import compile_rubric, iter_submissions, load_rubric
+    from econ_math_portfolio.store import ResultStore, rescore
+
+    raw_rubric = load_rubric(Path(_rubric_path()))
+    rubric = compile_rubric(raw_rubric)
+    with ResultStore(store) as results:
+        old = load_rubric(Path(since_rubric)) if since_rubric else results.last_rubric()
+        if old is None:
+            sys.stderr.write("rescore: store has no recorded rubric; pass --since-rubric\n")
+            return 1
+        old_rubric = compile_rubric(old)
+        stats: dict[str, int] = {}
+        stream = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+        try:
+            for diff in rescore(
+                iter_submissions(stream),
+                old_rubric=old_rubric,
+                rubric=rubric,
+                expected_for=_expected,
+                store=results,
+                stats=stats,
+            ):
+                sys.stdout.write(json.dumps(diff, sort_keys=True) + "\n")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        results.record_rubric(raw_rubric)
+    sys.stderr.write(json.dumps({"rescore": stats}, sort_keys=True) + "\n")
+    return 0
+
+
+def cmd_validate_batch(input_path: str, *, workers: int = 1, chunk_size: int = 256) -> int:
+    return _run_batch(_validate_chunk, input_path, workers=workers, chunk_size=chunk_size)
+
+
+def cmd_serve(
+    *, unix: str | None, host: str, port: int, workers: int, max_inflight: int, grace: float
+) -> int:
+    from pathlib import Path
+
+    from econ_math_portfolio import server
+
+    return server.serve(
+        Path(_rubric_path()),
+        unix=unix,
+        host=host,
+        port=port,
+        workers=workers,
+        max_inflight=max_inflight,
+        grace=grace,
+    )
+
+
+def _non_negative_int(text: str) -> int:
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0, got {value}")
+    return value
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {value}")
+    return value
+
+
+def cmd_variants_generate(
+    tasks: list[str], *, count: int, seed: int, start: int, workers: int, out: str
+) -> int:
+    from pathlib import Path
+
+    from econ_math_portfolio import variants
+
+    blocks = [variants.generate(t, count, seed=seed, start=start, workers=workers) for t in tasks]
+    variants.write_manifest(blocks, Path(out))
+    _emit({"manifest": out, "variants": count * len(blocks)}, as_json=True)
+    return 0
+
+
+def cmd_variants_show(variant: str, *, as_json: bool) -> int:
+    from dataclasses import asdict
+
+    from econ_math_portfolio import variants
+
+    task_id, variant = split_key(variant)
+    out = {
+        "task_id": task_id,
+        "variant": variant,
+        "params": asdict(variants.variant_params(variant)),
+        "reference": _expected(variant),
+    }
     _emit(out, as_json=as_json)
-    return 0 if sb.total >= 0.8 else 2
+    return 0
+
+
+def cmd_variants_convert(src: str, dst: str) -> int:
+    from pathlib import Path
+
+    from econ_math_portfolio import variants
+
+    written = variants.convert(Path(src), Path(dst))
+    _emit({"source": src, "output": dst, "format": written}, as_json=True)
+    return 0
+
+
+def cmd_cache(action: str, *, as_json: bool) -> int:
+    from econ_math_portfolio import cache
+
+    if action == "clear":
+        _emit({"removed": cache.clear(), "cache_dir": str(cache.cache_dir())}, as_json=as_json)
+    else:
+        _emit({"cache_dir": str(cache.cache_dir())}, as_json=as_json)
+    return 0
+
+
+def cmd_bench(
+    *,
+    out: str | None,
+    baseline: str | None,
+    threshold: float,
+    select: str | None,
+    quick: bool,
+) -> int:
+    from pathlib import Path
+
+    from econ_math_portfolio import bench
+
+    results = bench.run_benchmarks(quick=quick, select=select)
+    report = bench.to_json_dict(results)
+    if out:
+        Path(out).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    regressions = []
+    if baseline:
+        regressions = bench.find_regressions(
+            results, bench.load_baseline(Path(baseline)), threshold=threshold
+        )
+        report["regressions"] = regressions
+    _emit(report, as_json=True)
+    return 2 if regressions else 0
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -86,6 +486,30 @@ def main(argv: list[str] | None = None) -> int:
         prog="econ-math-portfolio", description="Math/Econ reasoning tasks + validators."
     )
     p.add_argument("--json", action="store_true", help="Output machine-readable JSON.")
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute reference values instead of using the on-disk cache.",
+    )
+    p.add_argument(
+        "--verify",
+        action="store_true",
+        help="Cross-check closed-form solutions against iterative solvers (implies --no-cache).",
+    )
+    p.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Batch and --answers runs: write aggregate timers and counters to stderr "
+        "(--json output always has them under 'metrics').",
+    )
+    p.add_argument(
+        "--profile", metavar="PATH", help="Run the command under cProfile; write .pstats"
+    )
+    p.add_argument(
+        "--variants",
+        metavar="PATH",
+        help="Variant manifest to look variant references up in (see 'variants generate')",
+    )
     sub = p.add_subparsers(dest="cmd", required=True)
 
     sub.add_parser("list", help="List task IDs")
@@ -95,19 +519,208 @@ def main(argv: list[str] | None = None) -> int:
 
     v = sub.add_parser("validate", help="Validate an answer for a task")
     v.add_argument("task_id")
-    v.add_argument("answer", type=float)
+    v.add_argument("answer", type=float, nargs="?")
+    v.add_argument(
+        "--answers",
+        metavar="PATH",
+        help="Validate many whitespace-separated answers from a file ('-' for stdin); "
+        "one JSON line per answer",
+    )
+    for tp in (r, v):
+        tp.add_argument("--variant", metavar="ID", help="A variant id, e.g. TASK_ID:SEED:INDEX")
 
     s = sub.add_parser("score", help="Score a JSON submission using rubric + expected answer")
     s.add_argument("submission_path", help="Path to submission JSON")
 
+    sb = sub.add_parser(
+        "score-batch", help="Score a JSONL stream of submissions (one JSON result per line)"
+    )
+    vb = sub.add_parser(
+        "validate-batch",
+        help="Validate a JSONL stream of {task_id, answer} records (one JSON result per line)",
+    )
+    for bp in (sb, vb):
+        bp.add_argument(
+            "input_path", nargs="?", default="-", help="Path to input JSONL ('-' for stdin)"
+        )
+        bp.add_argument(
+            "--workers",
+            type=_non_negative_int,
+            default=1,
+            help="Worker processes (results stay in order)",
+        )
+        bp.add_argument(
+            "--chunk-size", type=_positive_int, default=256, help="Records per worker task"
+        )
+    sb.add_argument("--store", metavar="PATH", help="SQLite results store: reuse unchanged results")
+    sb.add_argument(
+        "--group-by",
+        metavar="FIELD",
+        help="Copy this submission field (e.g. model) into each result and group summaries by it",
+    )
+    sb.add_argument(
+        "--summary",
+        metavar="PATH",
+        help="Also aggregate inline; write the summary here ('-': stderr)",
+    )
+
+    sm = sub.add_parser(
+        "summarize", help="Aggregate score-batch output per task (and group) in one pass"
+    )
+    sm.add_argument("input_path", nargs="?", default="-", help="score-batch output ('-' for stdin)")
+    sm.add_argument("--group-by", metavar="FIELD", help="Record field to group by, e.g. model")
+    sm.add_argument("--top", type=int, help="Keep only the N most frequent reasons per group")
+
+    rs = sub.add_parser(
+        "rescore",
+        help="Re-grade a JSONL stream after a rubric change; print only the changed scores",
+    )
+    rs.add_argument(
+        "input_path", nargs="?", default="-", help="Path to input JSONL ('-' for stdin)"
+    )
+    rs.add_argument("--store", metavar="PATH", required=True, help="SQLite results store")
+    rs.add_argument(
+        "--since-rubric",
+        metavar="PATH",
+        help="Previous rubric.json (default: the rubric recorded by the store's last run)",
+    )
+
+    sv = sub.add_parser(
+        "serve", help="Run a warm grading daemon (JSON lines on a Unix socket, or local HTTP)"
+    )
+    sv.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket (JSON lines)")
+    sv.add_argument("--host", default="127.0.0.1", help="HTTP bind address (default localhost)")
+    sv.add_argument("--port", type=int, default=8765, help="HTTP port (ignored with --unix)")
+    sv.add_argument(
+        "--workers", type=_non_negative_int, default=1, help="Processes for reference computations"
+    )
+    sv.add_argument(
+        "--max-inflight", type=int, default=64, help="Pipelined requests per connection"
+    )
+    sv.add_argument(
+        "--grace", type=float, default=10.0, help="Seconds to let in-flight requests finish"
+    )
+
+    va = sub.add_parser("variants", help="Seeded task variants: generate a manifest, show one")
+    vsub = va.add_subparsers(dest="variants_cmd", required=True)
+    vg = vsub.add_parser("generate", help="Sample variants and compute their references")
+    vg.add_argument("task_ids", nargs="+", choices=task_ids(), metavar="TASK_ID")
+    vg.add_argument("--count", type=_non_negative_int, default=1000, help="Variants per task")
+    vg.add_argument(
+        "--seed", type=_non_negative_int, default=0, help="Variant seed (part of the variant id)"
+    )
+    vg.add_argument("--start", type=_non_negative_int, default=0, help="First variant index")
+    vg.add_argument(
+        "--workers", type=_non_negative_int, default=1, help="Processes for reference computations"
+    )
+    vg.add_argument("--out", required=True, help="Manifest path (JSON)")
+    vs = vsub.add_parser("show", help="Parameters and reference of one variant id")
+    vs.add_argument("variant")
+    vc = vsub.add_parser(
+        "convert", help="JSON manifest -> binary variant table, or binary table -> JSON"
+    )
+    vc.add_argument("source", help="A JSON manifest or a binary table (detected from the file)")
+    vc.add_argument("output")
+
+    c = sub.add_parser("cache", help="Manage the on-disk reference-value cache")
+    c.add_argument("action", choices=["clear", "path"])
+
+    b = sub.add_parser("bench", help="Time models, solvers, validators, scoring and CLI startup")
+    b.add_argument("--out", help="Write the JSON report to this file (e.g. a new baseline)")
+    b.add_argument("--baseline", help="Compare against a stored JSON report")
+    b.add_argument(
+        "--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)"
+    )
+    b.add_argument("--filter", dest="select", help="Only run cases whose name contains this")
+    b.add_argument("--quick", action="store_true", help="Smaller Monte Carlo sizes")
+
     args = p.parse_args(argv)
+    if args.no_cache or args.verify:
+        from econ_math_portfolio import cache
+
+        cache.set_enabled(False)
+    if args.verify:
+        from econ_math_portfolio import solvers
+
+        solvers.set_verify(True)
+    if args.variants:
+        from econ_math_portfolio import variants
+
+        variants.set_manifest(args.variants)
+    global _REPORT_METRICS, _MANIFEST
+    _REPORT_METRICS = args.metrics
+    _MANIFEST = args.variants
+
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(_dispatch, args)
+        finally:
+            profiler.dump_stats(args.profile)
+    return _dispatch(args)
+
 
+def _dispatch(args: argparse.Namespace) -> int:
     if args.cmd == "list":
         return cmd_list(as_json=args.json)
     if args.cmd == "reference":
-        return cmd_reference(args.task_id, as_json=args.json)
+        return cmd_reference(args.task_id, variant=args.variant, as_json=args.json)
     if args.cmd == "validate":
-        return cmd_validate(args.task_id, args.answer, as_json=args.json)
+        if (args.answer is None) == (args.answers is None):
+            sys.stderr.write("validate: give either ANSWER or --answers PATH\n")
+            return 1
+        if args.answers is not None:
+            return cmd_validate_many(args.task_id, args.answers, variant=args.variant)
+        return cmd_validate(args.task_id, args.answer, variant=args.variant, as_json=args.json)
     if args.cmd == "score":
         return cmd_score(args.submission_path, as_json=args.json)
+    if args.cmd == "score-batch":
+        return cmd_score_batch(
+            args.input_path,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            store=args.store,
+            group_by=args.group_by,
+            summary=args.summary,
+        )
+    if args.cmd == "summarize":
+        return cmd_summarize(args.input_path, group_by=args.group_by, top=args.top)
+    if args.cmd == "rescore":
+        return cmd_rescore(args.input_path, store=args.store, since_rubric=args.since_rubric)
+    if args.cmd == "validate-batch":
+        return cmd_validate_batch(args.input_path, workers=args.workers, chunk_size=args.chunk_size)
+    if args.cmd == "bench":
+        return cmd_bench(
+            out=args.out,
+            baseline=args.baseline,
+            threshold=args.threshold,
+            select=args.select,
+            quick=args.quick,
+        )
+    if args.cmd == "serve":
+        return cmd_serve(
+            unix=args.unix,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            max_inflight=args.max_inflight,
+            grace=args.grace,
+        )
+    if args.cmd == "variants" and args.variants_cmd == "generate":
+        return cmd_variants_generate(
+            args.task_ids,
+            count=args.count,
+            seed=args.seed,
+            start=args.start,
+            workers=args.workers,
+            out=args.out,
+        )
+    if args.cmd == "variants" and args.variants_cmd == "convert":
+        return cmd_variants_convert(args.source, args.output)
+    if args.cmd == "variants":
+        return cmd_variants_show(args.variant, as_json=args.json)
+    if args.cmd == "cache":
+        return cmd_cache(args.action, as_json=args.json)
     return 1
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.scoring import CompiledRubric, ScoreBreakdown, compile_rubric
+from econ_math_portfolio.utils.optional import numpy_or_none
+
+# Bits of ``ColumnScores.reasons``; ``breakdown(i)`` turns them back into the reason strings
+# ``score_submission`` would have produced, in the same order.
+UNKNOWN_TASK = 1
+NOT_A_NUMBER = 2
+OUT_OF_BOUNDS = 4
+ABOVE_TOLERANCE = 8
+MISSING_EXPLANATION = 16
+
+REASON_BITS = {
+    "unknown_task": UNKNOWN_TASK,
+    "not_a_number": NOT_A_NUMBER,
+    "out_of_bounds": OUT_OF_BOUNDS,
+    "above_tolerance": ABOVE_TOLERANCE,
+    "missing_explanation": MISSING_EXPLANATION,
+}
+
+# An explanation earns the reasoning component at this many whitespace-separated words.
+REASONING_MIN_WORDS = 8
+
+
+def word_count(explanation: Any) -> int:
+    """The ``words`` column entry for one explanation (0 for missing or blank)."""
+    return len(explanation.split()) if isinstance(explanation, str) else 0
+
+
+@dataclass(frozen=True)
+class ColumnScores:
+    """Result columns of ``score_columns``: one entry per input row.
+
+    Score columns are float64 arrays and ``reasons`` a uint8 bitmask (lists of floats / ints
+    without NumPy). ``abs_error`` is NaN where no numeric comparison was made.
+    """
+
+    task_id: Any
+    answer: Any
+    total: Any
+    format_score: Any
+    numeric_score: Any
+    reasoning_score: Any
+    reasons: Any
+    abs_error: Any
+    rubric: CompiledRubric
+
+    def __len__(self) -> int:
+        return len(self.total)
+
+    def breakdown(self, i: int) -> ScoreBreakdown:
+        """Materialize row ``i`` as the ``ScoreBreakdown`` ``score_submission`` returns."""
+        task_id = str(self.task_id[i])
+        bits = int(self.reasons[i])
+        reasons: List[str] = []
+        if bits & UNKNOWN_TASK:
+            reasons.append(f"unknown task_id: {task_id}")
+        if bits & NOT_A_NUMBER:
+            reasons.append("answer is not a number")
+        if bits & OUT_OF_BOUNDS:
+            lo, hi = self.rubric.tasks[task_id].bounds  # type: ignore[misc]
+            reasons.append(f"answer out of bounds [{lo}, {hi}]")
+        if bits & ABOVE_TOLERANCE:
+            tol = self.rubric.tasks[task_id].tolerance
+            reasons.append(f"abs_error={float(self.abs_error[i])} exceeds tolerance={tol}")
+        if bits & MISSING_EXPLANATION:
+            reasons.append("missing explanation")
+        return ScoreBreakdown(
+            total=float(self.total[i]),
+            format_score=float(self.format_score[i]),
+            numeric_score=float(self.numeric_score[i]),
+            reasoning_score=float(self.reasoning_score[i]),
+            reasons=reasons,
+        )
+
+    def breakdowns(self) -> Iterator[ScoreBreakdown]:
+        for i in range(len(self)):
+            yield self.breakdown(i)
+
+
+def _total_table(rubric: CompiledRubric) -> List[float]:
+    # Component scores are 0/1, so a total is one of eight values; rounding them here with
+    # Python's round() keeps totals bit-identical to ``score_submission``.
+    return [
+        round(rubric.w_format * f + rubric.w_numeric * n + rubric.w_reasoning * r, 6)
+        for f in (0.0, 1.0)
+        for n in (0.0, 1.0)
+        for r in (0.0, 1.0)
+    ]
+
+
+def score_columns(
+    task_id: Any = None,
+    answer: Any = None,
+    words: Any = None,
+    *,
+    format_ok: Any = None,
+    records: Any = None,
+    rubric: CompiledRubric | dict,
+    expected_for: Callable[[str], float],
+    backend: str = "numpy",
+) -> ColumnScores:
+    """Score parallel columns (or a structured array) in one vectorized pass.
+
+    Columns: ``task_id`` (str), ``answer`` (float), ``words`` (explanation word count, see
+    ``word_count``) and optionally ``format_ok`` (False where the raw answer was not a number;
+    default all True). ``records`` may instead be a structured NumPy array with those fields.
+    Rows are grouped by task: ``expected_for`` is called once per distinct known task id and
+    each task's tolerance/bounds/explanation rule is broadcast to its rows.
+    """
+    if not isinstance(rubric, CompiledRubric):
+        rubric = compile_rubric(rubric)
+    if records is not None:
+        names = records.dtype.names
+        task_id, answer, words = records["task_id"], records["answer"], records["words"]
+        format_ok = records["format_ok"] if "format_ok" in names else None
+
+    np = numpy_or_none() if backend == "numpy" else None
+    with METRICS.phase("scoring"):
+        if np is None:
+            out = _score_columns_python(task_id, answer, words, format_ok, rubric, expected_for)
+        else:
+            out = _score_columns_numpy(np, task_id, answer, words, format_ok, rubric, expected_for)
+    METRICS.incr("submissions_scored", len(out))
+    return out
+
+
+def _score_columns_numpy(
+    np: Any,
+    task_id: Any,
+    answer: Any,
+    words: Any,
+    format_ok: Any,
+    rubric: CompiledRubric,
+    expected_for: Callable[[str], float],
+) -> ColumnScores:
+    task_id = np.asarray(task_id)
+    answer = np.asarray(answer, dtype=np.float64)
+    words = np.asarray(words, dtype=np.int64)
+    n = len(task_id)
+    fmt_ok = np.ones(n, dtype=bool) if format_ok is None else np.asarray(format_ok, dtype=bool)
+
+    # Per distinct task id, then gathered back to rows through the inverse index.
+    uniq, inv = np.unique(task_id, return_inverse=True)
+    k = len(uniq)
+    known_u = np.zeros(k, dtype=bool)
+    tol_u = np.zeros(k)
+    lo_u = np.full(k, -np.inf)
+    hi_u = np.full(k, np.inf)
+    bounded_u = np.zeros(k, dtype=bool)
+    req_u = np.zeros(k, dtype=bool)
+    exp_u = np.full(k, np.nan)
+    for j, t in enumerate(uniq.tolist()):
+        cfg = rubric.tasks.get(str(t))
+        if cfg is None:
+            continue
+        known_u[j] = True
+        tol_u[j] = cfg.tolerance
+        req_u[j] = cfg.require_explanation
+        if cfg.bounds is not None:
+            bounded_u[j] = True
+            lo_u[j], hi_u[j] = cfg.bounds
+        exp_u[j] = float(expected_for(str(t)))
+
+    known = known_u[inv]
+    numeric_ok = known & fmt_ok
+    with np.errstate(invalid="ignore"):
+        abs_err = np.where(numeric_ok, np.abs(answer - exp_u[inv]), np.nan)
+        in_bounds = (lo_u[inv] <= answer) & (answer <= hi_u[inv])
+        hit = numeric_ok & (abs_err <= tol_u[inv])
+    missing = known & req_u[inv] & (words == 0)
+    reasoned = known & ~missing & (words >= REASONING_MIN_WORDS)
+
+    reasons = np.where(known, 0, UNKNOWN_TASK).astype(np.uint8)
+    reasons |= np.where(known & ~fmt_ok, NOT_A_NUMBER, 0).astype(np.uint8)
+    reasons |= np.where(numeric_ok & bounded_u[inv] & ~in_bounds, OUT_OF_BOUNDS, 0).astype(np.uint8)
+    reasons |= np.where(numeric_ok & ~hit, ABOVE_TOLERANCE, 0).astype(np.uint8)
+    reasons |= np.where(missing, MISSING_EXPLANATION, 0).astype(np.uint8)
+
+    f, m, r = numeric_ok.astype(np.float64), hit.astype(np.float64), reasoned.astype(np.float64)
+    code = 4 * numeric_ok.astype(np.intp) + 2 * hit.astype(np.intp) + reasoned.astype(np.intp)
+    total = np.asarray(_total_table(rubric))[code]
+    return ColumnScores(task_id, answer, total, f, m, r, reasons, abs_err, rubric)
+
+
+def _score_columns_python(
+    task_id: Sequence[Any],
+    answer: Sequence[float],
+    words: Sequence[int],
+    format_ok: Optional[Sequence[bool]],
+    rubric: CompiledRubric,
+    expected_for: Callable[[str], float],
+) -> ColumnScores:
+    table = _total_table(rubric)
+    expected: Dict[str, float] = {}
+    cols: Dict[str, list] = {
+        k: [] for k in ("total", "format", "numeric", "reasoning", "reasons", "abs_error")
+    }
+    for i, (t, a, w) in enumerate(zip(task_id, answer, words, strict=True)):
+        t = str(t)
+        cfg = rubric.tasks.get(t)
+        ok = True if format_ok is None else bool(format_ok[i])
+        fmt = hit = reasoned = False
+        bits = 0
+        err = math.nan
+        if cfg is None:
+            bits = UNKNOWN_TASK
+        else:
+            if t not in expected:
+                expected[t] = float(expected_for(t))
+            if not ok:
+                bits |= NOT_A_NUMBER
+            else:
+                fmt = True
+                a = float(a)
+                if cfg.bounds is not None and not (cfg.bounds[0] <= a <= cfg.bounds[1]):
+                    bits |= OUT_OF_BOUNDS
+                err = abs(a - expected[t])
+                hit = err <= cfg.tolerance
+                if not hit:
+                    bits |= ABOVE_TOLERANCE
+            if cfg.require_explanation and int(w) == 0:
+                bits |= MISSING_EXPLANATION
+            else:
+                reasoned = int(w) >= REASONING_MIN_WORDS
+        cols["total"].append(table[4 * fmt + 2 * hit + reasoned])
+        cols["format"].append(float(fmt))
+        cols["numeric"].append(float(hit))
+        cols["reasoning"].append(float(reasoned))
+        cols["reasons"].append(bits)
+        cols["abs_error"].append(err)
+    return ColumnScores(
+        list(task_id),
+        list(answer),
+        cols["total"],
+        cols["format"],
+        cols["numeric"],
+        cols["reasoning"],
+        cols["reasons"],
+        cols["abs_error"],
+        rubric,
+    )
@@ -3,6 +3,25 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass
 
+from econ_math_portfolio.solvers import (
+    CLOSED_FORM,
+    BatchRoots,
+    RootResult,
+    bisect_batch,
+    broadcast_lists,
+    closed_form_root,
+    find_root,
+)
+from econ_math_portfolio.utils.optional import numpy_or_none
+
+TYPE_CHECKING = False  # as in ``solvers``: keeps typing off the validator import path
+if TYPE_CHECKING:
+    from typing import Any
+
+# Log utility inverts in closed form; Newton (analytic derivative) verifies it.
+DEFAULT_METHOD = CLOSED_FORM
+VERIFY_METHOD = "newton"
+
 
 @dataclass(frozen=True)
 class ContractParams:
@@ -16,30 +35,100 @@ def lifetime_utility(delta: float, c_low: float, c_high: float) -> float:
     return (0.5 * math.log(c_low) + 0.5 * math.log(c_high)) / (1.0 - delta)
 
 
-def solve_c_high(
-    params: ContractParams, *, lo: float = 1e-8, hi: float = 10.0, iters: int = 200
-) -> float:
+def c_high_closed_form(params: ContractParams) -> float:
+    """c_high = exp(2(1-delta)V0 - log c_low), the exact inverse of ``lifetime_utility``."""
+    try:
+        return math.exp(2.0 * (1.0 - params.delta) * params.V0 - math.log(params.c_low))
+    except OverflowError:
+        return math.inf
+
+
+def c_high_root(
+    params: ContractParams,
+    *,
+    lo: float = 1e-8,
+    hi: float = 10.0,
+    iters: int = 200,
+    method: str = DEFAULT_METHOD,
+) -> RootResult:
+    """Unclamped root of V(c_high) = V0, with the solver's iteration/evaluation counts."""
+    if method == CLOSED_FORM:
+        return closed_form_root(
+            c_high_closed_form(params),
+            lo,
+            hi,
+            lambda: c_high_root(params, lo=lo, hi=hi, iters=iters, method=VERIFY_METHOD),
+        )
+
     def f(c_high: float) -> float:
         return lifetime_utility(params.delta, params.c_low, c_high) - params.V0
 
-    f_lo = f(lo)
-    f_hi = f(hi)
-    if f_lo * f_hi > 0:
-        raise ValueError("Root not bracketed: widen [lo, hi].")
-
-    for _ in range(iters):
-        mid = 0.5 * (lo + hi)
-        f_mid = f(mid)
-        if abs(f_mid) < 1e-12:
-            c_high = mid
-            break
-        if f_lo * f_mid <= 0:
-            hi = mid
-            f_hi = f_mid
-        else:
-            lo = mid
-            f_lo = f_mid
-    else:
-        c_high = 0.5 * (lo + hi)
+    def df(c_high: float) -> float:
+        return 0.5 / ((1.0 - params.delta) * c_high)
+
+    return find_root(f, lo, hi, method=method, df=df, iters=iters)
 
+
+def solve_c_high(
+    params: ContractParams,
+    *,
+    lo: float = 1e-8,
+    hi: float = 10.0,
+    iters: int = 200,
+    method: str = DEFAULT_METHOD,
+) -> float:
+    c_high = c_high_root(params, lo=lo, hi=hi, iters=iters, method=method).root
     return max(c_high, params.autarky_high)
+
+
+def solve_c_high_batch(
+    *,
+    delta: Any = ContractParams.delta,
+    V0: Any = ContractParams.V0,
+    c_low: Any = ContractParams.c_low,
+    autarky_high: Any = ContractParams.autarky_high,
+    lo: float = 1e-8,
+    hi: float = 10.0,
+    iters: int = 200,
+    method: str = DEFAULT_METHOD,
+    backend: str = "numpy",
+) -> BatchRoots:
+    """Array-in/array-out ``solve_c_high`` for parameter sweeps.
+
+    Each parameter is a scalar or an array (broadcast together). All grid points are solved
+    at once, by the closed form or (any other ``method``) by vectorized bisection; points whose
+    root is not in [lo, hi] get ``ok=False`` and NaN instead of raising. The ``autarky_high``
+    clamp is applied to every solved point. Without NumPy (or with ``backend="python"``) each
+    point runs through ``solve_c_high``.
+    """
+    np = numpy_or_none() if backend == "numpy" else None
+    if np is None:
+        values, ok = [], []
+        for d, v0, cl, ah in zip(*broadcast_lists(delta, V0, c_low, autarky_high), strict=True):
+            try:
+                values.append(
+                    solve_c_high(
+                        ContractParams(d, v0, cl, ah), lo=lo, hi=hi, iters=iters, method=method
+                    )
+                )
+                ok.append(True)
+            except ValueError:
+                values.append(float("nan"))
+                ok.append(False)
+        return BatchRoots(values=values, ok=ok)
+
+    delta, V0, c_low, autarky_high = (
+        np.asarray(a, dtype=np.float64) for a in (delta, V0, c_low, autarky_high)
+    )
+
+    def f(c_high: Any) -> Any:
+        return (0.5 * np.log(c_low) + 0.5 * np.log(c_high)) / (1.0 - delta) - V0
+
+    if method == CLOSED_FORM:
+        with np.errstate(over="ignore"):
+            root = np.exp(2.0 * (1.0 - delta) * V0 - np.log(c_low))
+        ok = (lo <= root) & (root <= hi)
+        roots = BatchRoots(values=np.where(ok, root, np.nan), ok=ok)
+    else:
+        roots = bisect_batch(np, f, lo, hi, iters=iters)
+    return BatchRoots(values=np.maximum(roots.values, autarky_high), ok=roots.ok)
@@ -2,6 +2,25 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from econ_math_portfolio.solvers import (
+    CLOSED_FORM,
+    BatchRoots,
+    RootResult,
+    bisect_batch,
+    broadcast_lists,
+    closed_form_root,
+    find_root,
+)
+from econ_math_portfolio.utils.optional import numpy_or_none
+
+TYPE_CHECKING = False  # as in ``solvers``: keeps typing off the validator import path
+if TYPE_CHECKING:
+    from typing import Any
+
+# CPI is linear in t: solve_t is one division; Newton (one step) verifies it.
+DEFAULT_METHOD = CLOSED_FORM
+VERIFY_METHOD = "newton"
+
 
 @dataclass(frozen=True)
 class CpiParams:
@@ -21,24 +40,91 @@ def cpi(t: float, params: CpiParams) -> float:
     return (params.EI_a + params.EI_b + ei_c(t, params)) / 3.0
 
 
-def solve_t(params: CpiParams, *, lo: float = 0.0, hi: float = 1.0, iters: int = 200) -> float:
+def t_closed_form(params: CpiParams) -> float:
+    """Invert the linear CPI(t) = target for t (NaN if CPI does not depend on t)."""
+    if params.discount_coeff == 0.0:
+        return float("nan")  # no unique root; ``closed_form_root`` reports it as not bracketed
+    ei_needed = 3.0 * params.target_cpi - params.EI_a - params.EI_b
+    return (1.0 - ei_needed * params.base_c / (100.0 * params.price_c)) / params.discount_coeff
+
+
+def t_root(
+    params: CpiParams,
+    *,
+    lo: float = 0.0,
+    hi: float = 1.0,
+    iters: int = 200,
+    method: str = DEFAULT_METHOD,
+) -> RootResult:
+    """Root of CPI(t) = target, with the solver's iteration/evaluation counts."""
+    if method == CLOSED_FORM:
+        return closed_form_root(
+            t_closed_form(params),
+            lo,
+            hi,
+            lambda: t_root(params, lo=lo, hi=hi, iters=iters, method=VERIFY_METHOD),
+        )
+
     def f(x: float) -> float:
         return cpi(x, params) - params.target_cpi
 
-    f_lo = f(lo)
-    f_hi = f(hi)
-    if f_lo * f_hi > 0:
-        raise ValueError("Target not bracketed on [0,1].")
-
-    for _ in range(iters):
-        mid = 0.5 * (lo + hi)
-        f_mid = f(mid)
-        if abs(f_mid) < 1e-12:
-            return mid
-        if f_lo * f_mid <= 0:
-            hi = mid
-            f_hi = f_mid
-        else:
-            lo = mid
-            f_lo = f_mid
-    return 0.5 * (lo + hi)
+    def df(x: float) -> float:
+        return -(params.price_c * params.discount_coeff / params.base_c) * 100.0 / 3.0
+
+    return find_root(f, lo, hi, method=method, df=df, iters=iters)
+
+
+def solve_t(
+    params: CpiParams,
+    *,
+    lo: float = 0.0,
+    hi: float = 1.0,
+    iters: int = 200,
+    method: str = DEFAULT_METHOD,
+) -> float:
+    return t_root(params, lo=lo, hi=hi, iters=iters, method=method).root
+
+
+def solve_t_batch(
+    *,
+    EI_a: Any = CpiParams.EI_a,
+    EI_b: Any = CpiParams.EI_b,
+    base_c: Any = CpiParams.base_c,
+    price_c: Any = CpiParams.price_c,
+    discount_coeff: Any = CpiParams.discount_coeff,
+    target_cpi: Any = CpiParams.target_cpi,
+    lo: float = 0.0,
+    hi: float = 1.0,
+    iters: int = 200,
+    method: str = DEFAULT_METHOD,
+    backend: str = "numpy",
+) -> BatchRoots:
+    """Array-in/array-out ``solve_t``: unbracketed grid points are masked, not raised."""
+    args = (EI_a, EI_b, base_c, price_c, discount_coeff, target_cpi)
+    np = numpy_or_none() if backend == "numpy" else None
+    if np is None:
+        values, ok = [], []
+        for row in zip(*broadcast_lists(*args), strict=True):
+            try:
+                values.append(solve_t(CpiParams(*row), lo=lo, hi=hi, iters=iters, method=method))
+                ok.append(True)
+            except ValueError:
+                values.append(float("nan"))
+                ok.append(False)
+        return BatchRoots(values=values, ok=ok)
+
+    EI_a, EI_b, base_c, price_c, discount_coeff, target_cpi = (
+        np.asarray(a, dtype=np.float64) for a in args
+    )
+
+    def f(t: Any) -> Any:
+        ei = (price_c * (1.0 - discount_coeff * t) / base_c) * 100.0
+        return (EI_a + EI_b + ei) / 3.0 - target_cpi
+
+    if method == CLOSED_FORM:
+        ei_needed = 3.0 * target_cpi - EI_a - EI_b
+        with np.errstate(divide="ignore", invalid="ignore"):  # discount_coeff == 0: inf/NaN
+            root = (1.0 - ei_needed * base_c / (100.0 * price_c)) / discount_coeff
+        ok = (lo <= root) & (root <= hi)
+        return BatchRoots(values=np.where(ok, root, np.nan), ok=ok)
+    return bisect_batch(np, f, lo, hi, iters=iters)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Any, Sequence
+
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.models.credit_var_quantile import BACKENDS, CreditParams
+from econ_math_portfolio.utils.optional import numpy_or_none
+
+
+@dataclass(frozen=True)
+class PortfolioParams:
+    """Finite portfolio of heterogeneous obligors under a Gaussian (multi-)factor copula.
+
+    Obligor i defaults when sqrt(1 - |w_i|^2) * eps_i < Phi^{-1}(PD_i) + w_i . Z, with
+    Z ~ N(0, I_F) systematic and eps_i ~ N(0, 1) idiosyncratic. ``loadings`` holds one row
+    w_i per obligor; a one-factor model with asset correlation rho has w_i = (sqrt(rho),).
+    """
+
+    exposure: tuple[float, ...]
+    pd: tuple[float, ...]
+    lgd: tuple[float, ...]
+    loadings: tuple[tuple[float, ...], ...]
+    alpha: float = 0.999
+
+    def __post_init__(self) -> None:
+        n = len(self.exposure)
+        if n == 0 or not (len(self.pd) == len(self.lgd) == len(self.loadings) == n):
+            raise ValueError("exposure, pd, lgd and loadings must be non-empty and equal length.")
+        if len({len(w) for w in self.loadings}) != 1:
+            raise ValueError("every obligor needs the same number of factor loadings.")
+        if not all(0.0 < p < 1.0 for p in self.pd):
+            raise ValueError("PD must lie in (0, 1).")
+        if not all(sum(x * x for x in w) < 1.0 for w in self.loadings):
+            raise ValueError("squared factor loadings must sum to less than 1.")
+        if not 0.0 < self.alpha < 1.0:
+            raise ValueError("alpha must lie in (0, 1).")
+
+    @property
+    def n_obligors(self) -> int:
+        return len(self.exposure)
+
+    @property
+    def n_factors(self) -> int:
+        return len(self.loadings[0])
+
+
+@dataclass(frozen=True)
+class PortfolioRisk:
+    var: float
+    es: float
+    n_scenarios: int
+    alpha: float
+
+
+def one_factor_portfolio(
+    exposure: Sequence[float],
+    pd: Sequence[float],
+    lgd: Sequence[float],
+    rho: float,
+    *,
+    alpha: float = 0.999,
+) -> PortfolioParams:
+    w = (math.sqrt(rho),)
+    return PortfolioParams(
+        exposure=tuple(float(e) for e in exposure),
+        pd=tuple(float(p) for p in pd),
+        lgd=tuple(float(x) for x in lgd),
+        loadings=tuple(w for _ in exposure),
+        alpha=alpha,
+    )
+
+
+def granular_portfolio(params: CreditParams, n_obligors: int) -> PortfolioParams:
+    """Split ``params.E`` equally over ``n_obligors``; tends to ``var_analytic`` as n grows."""
+    n = n_obligors
+    return one_factor_portfolio(
+        [params.E / n] * n, [params.PD] * n, [params.LGD] * n, params.rho, alpha=params.alpha
+    )
+
+
+# Per-process simulation state, set once per worker so chunks don't re-pickle the portfolio.
+_STATE: dict[str, Any] = {}
+
+
+def _init_state(portfolio: PortfolioParams, backend: str, obligor_block: int) -> None:
+    nd = NormalDist()
+    c = [nd.inv_cdf(p) for p in portfolio.pd]
+    s = [math.sqrt(1.0 - sum(x * x for x in w)) for w in portfolio.loadings]
+    el = [e * g for e, g in zip(portfolio.exposure, portfolio.lgd, strict=True)]
+    np = numpy_or_none() if backend == "numpy" else None
+    if np is not None:
+        arrays = (np.array(c), np.array(s), np.array(el), np.array(portfolio.loadings))
+    else:
+        arrays = (c, s, el, portfolio.loadings)
+    _STATE.update(np=np, arrays=arrays, block=obligor_block, F=portfolio.n_factors)
+
+
+def _chunk_tail(seed: int, chunk: int, n: int, k: int) -> list[float]:
+    """Simulate ``n`` scenarios of chunk ``chunk``; return its ``k`` largest losses.
+
+    Draws depend only on (seed, chunk), never on which worker runs the chunk.
+    """
+    np = _STATE["np"]
+    c, s, el, w = _STATE["arrays"]
+    n_factors = _STATE["F"]
+    if np is not None:
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk,)))
+        z = rng.standard_normal((n, n_factors))
+        losses = np.zeros(n)
+        block = _STATE["block"]
+        for start in range(0, c.shape[0], block):
+            sl = slice(start, start + block)
+            thr = (c[sl] + z @ w[sl].T) / s[sl]
+            losses += (rng.standard_normal(thr.shape) < thr) @ el[sl]
+        if k < n:
+            losses = np.partition(losses, n - k)[n - k :]
+        return losses.tolist()
+
+    rnd = random.Random(f"{seed}/{chunk}")
+    losses_py = []
+    for _ in range(n):
+        z_py = [rnd.gauss(0.0, 1.0) for _ in range(n_factors)]
+        loss = 0.0
+        for ci, si, eli, wi in zip(c, s, el, w, strict=True):
+            thr = (ci + sum(a * b for a, b in zip(wi, z_py, strict=True))) / si
+            if rnd.gauss(0.0, 1.0) < thr:
+                loss += eli
+        losses_py.append(loss)
+    return heapq.nlargest(k, losses_py)
+
+
+def simulate_portfolio_risk(
+    portfolio: PortfolioParams,
+    *,
+    n_scenarios: int = 100_000,
+    seed: int = 7,
+    chunk_scenarios: int = 10_000,
+    obligor_block: int = 512,
+    workers: int = 1,
+    backend: str = "numpy",
+) -> PortfolioRisk:
+    """Monte Carlo VaR and ES of portfolio loss, simulated in fixed-size scenario chunks.
+
+    Chunk j uses its own stream seeded from (seed, j), so the result is identical for any
+    ``workers``. Each chunk keeps only its tail (the n_scenarios - idx largest losses, with the
+    same quantile index as ``var_mc``), and obligors are processed in blocks of
+    ``obligor_block``; memory per worker is O(chunk_scenarios * obligor_block).
+    ES is the mean of the losses at or beyond VaR. With ``backend="numpy"`` and NumPy missing
+    the pure-Python path is used (same semantics, different stream).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend: {backend!r} (expected one of {BACKENDS})")
+    METRICS.incr("mc_scenarios", n_scenarios)
+    idx = int(portfolio.alpha * (n_scenarios - 1))
+    k = n_scenarios - idx
+    tasks = [
+        (seed, j, min(chunk_scenarios, n_scenarios - start), k)
+        for j, start in enumerate(range(0, n_scenarios, chunk_scenarios))
+    ]
+
+    init_args = (portfolio, backend, obligor_block)
+    if workers <= 1:
+        _init_state(*init_args)
+        tails = [_chunk_tail(*t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_state, initargs=init_args) as ex:
+            tails = list(ex.map(_chunk_tail, *zip(*tasks, strict=True)))
+
+    tail = heapq.nlargest(k, (x for t in tails for x in t))
+    return PortfolioRisk(
+        var=float(tail[-1]),
+        es=float(sum(tail) / len(tail)),
+        n_scenarios=n_scenarios,
+        alpha=portfolio.alpha,
+    )
@@ -1,9 +1,26 @@
 from __future__ import annotations
 
+import heapq
 import math
 import random
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from statistics import NormalDist
+from typing import Any, Iterable, Optional
+
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.utils.optional import numpy_or_none
+
+BACKENDS = ("python", "numpy")
+SAMPLING_SCHEMES = ("plain", "antithetic", "stratified", "sobol")
+STREAM_CHUNK = 1 << 20
+STREAMS = ("sequential", "counter")
+
+# splitmix64 (Steele, Lea & Flood 2014): golden-ratio increment and finalizer constants.
+_GAMMA = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+_MASK64 = (1 << 64) - 1
 
 
 @dataclass(frozen=True)
@@ -24,15 +41,370 @@ def var_analytic(params: CreditParams) -> float:
     return params.E * params.LGD * q
 
 
-def var_mc(params: CreditParams, *, n_paths: int = 50_000, seed: int = 7) -> float:
+@dataclass(frozen=True)
+class McEstimate:
+    value: float
+    std_error: float
+    n_paths: int
+    sampling: str
+    bias: float = 0.0  # known offset of E[value] from the quantile (stratified / sobol)
+
+
+def _quantile_index(alpha: float, n_paths: int) -> int:
+    return int(alpha * (n_paths - 1))
+
+
+def _loss_at_uniform(params: CreditParams, u: float) -> float:
+    """Loss as a function of the factor's uniform draw: L(Phi^{-1}(u)), non-decreasing in u."""
+    return _loss_at_factor(params, NormalDist().inv_cdf(u))
+
+
+def _radical_inverse2(i: int) -> float:
+    v, f = 0.0, 0.5
+    while i:
+        if i & 1:
+            v += f
+        i >>= 1
+        f *= 0.5
+    return v
+
+
+def _uniforms_python(sampling: str, m: int, rnd: random.Random) -> list[float]:
+    if sampling == "plain":
+        return [rnd.random() for _ in range(m)]
+    if sampling == "antithetic":
+        u = [rnd.random() for _ in range(m // 2)]
+        return u + [1.0 - x for x in u] + [rnd.random() for _ in range(m % 2)]
+    if sampling == "stratified":
+        return [(i + rnd.random()) / m for i in range(m)]
+    shift = rnd.random()
+    return [(_radical_inverse2(i) + shift) % 1.0 for i in range(m)]
+
+
+def _uniforms_numpy(np: Any, sampling: str, m: int, rng: Any) -> Any:
+    if sampling == "plain":
+        return rng.random(m)
+    if sampling == "antithetic":
+        u = rng.random(m // 2)
+        return np.concatenate([u, 1.0 - u, rng.random(m % 2)])
+    if sampling == "stratified":
+        return (np.arange(m) + rng.random(m)) / m
+    shift = rng.random()
+    i = np.arange(m, dtype=np.uint64)
+    v = np.zeros(m)
+    f = 0.5
+    for b in range(max(m - 1, 1).bit_length()):
+        v += ((i >> np.uint64(b)) & np.uint64(1)) * f
+        f *= 0.5
+    return (v + shift) % 1.0
+
+
+def _loss_at_factor(params: CreditParams, z: float) -> float:
+    nd = NormalDist()
+    x = (nd.inv_cdf(params.PD) + math.sqrt(params.rho) * z) / math.sqrt(1.0 - params.rho)
+    return params.E * params.LGD * nd.cdf(x)
+
+
+def _streaming_order_stat(draws: Iterable[float], n: int, idx: int) -> float:
+    """``idx``-th smallest of ``n`` streamed draws, holding only min(idx+1, n-idx) of them.
+
+    A bounded min-heap keeps the n-idx largest values (or a negated max-heap the idx+1
+    smallest, whichever tail is shorter); its root is the requested order statistic.
+    """
+    heap: list[float] = []
+    if n - idx <= idx + 1:
+        k = n - idx
+        for x in draws:
+            if len(heap) < k:
+                heapq.heappush(heap, x)
+            elif x > heap[0]:
+                heapq.heapreplace(heap, x)
+        return heap[0]
+    k = idx + 1
+    for x in draws:
+        if len(heap) < k:
+            heapq.heappush(heap, -x)
+        elif -x > heap[0]:
+            heapq.heapreplace(heap, -x)
+    return -heap[0]
+
+
+def _streaming_order_stat_numpy(np: Any, chunks: Iterable[Any], n: int, idx: int) -> float:
+    """Chunked counterpart of ``_streaming_order_stat``: memory O(tail + chunk)."""
+    keep = np.empty(0)
+    if n - idx <= idx + 1:
+        k = n - idx
+        for c in chunks:
+            keep = np.concatenate([keep, c])
+            if keep.shape[0] > k:
+                keep = np.partition(keep, keep.shape[0] - k)[-k:]
+        return float(keep.min())
+    k = idx + 1
+    for c in chunks:
+        keep = np.concatenate([keep, c])
+        if keep.shape[0] > k:
+            keep = np.partition(keep, k - 1)[:k]
+    return float(keep.max())
+
+
+def _mix64(x: int) -> int:
+    x = ((x ^ (x >> 30)) * _MIX1) & _MASK64
+    x = ((x ^ (x >> 27)) * _MIX2) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _bits_to_uniform(x: int) -> float:
+    # k + 0.5 with k < 2^52 needs 53 significant bits: exact, and strictly inside (0, 1).
+    return ((x >> 12) + 0.5) * 2.0**-52
+
+
+def counter_uniforms(seed: int, start: int, count: int, *, backend: str = "python") -> Any:
+    """Uniform draws of paths ``start .. start+count-1`` of the counter stream keyed by ``seed``.
+
+    Path i's draw is splitmix64 evaluated at its own counter, mix64(key + (i+1)*gamma) with
+    key = mix64(seed), so it depends only on (seed, i) and any range of paths can be drawn
+    without generating the ones before it. The top 52 bits map to (k + 0.5) * 2^-52, which
+    is exact in float64 and so never 0 or 1. The numpy backend returns an array (a list
+    otherwise) holding the same values.
+    """
+    if start < 0 or count < 0:
+        raise ValueError("counter streams need start >= 0 and count >= 0.")
+    key = _mix64(seed & _MASK64)
+    np = numpy_or_none() if backend == "numpy" else None
+    if np is not None:
+        # uint64 array arithmetic wraps modulo 2^64, exactly like the masked python ints.
+        x = np.arange(start + 1, start + count + 1, dtype=np.uint64) * np.uint64(_GAMMA)
+        x += np.uint64(key)
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(_MIX1)
+        x ^= x >> np.uint64(27)
+        x *= np.uint64(_MIX2)
+        x ^= x >> np.uint64(31)
+        return ((x >> np.uint64(12)).astype(np.float64) + 0.5) * 2.0**-52
+    return [
+        _bits_to_uniform(_mix64((key + i * _GAMMA) & _MASK64))
+        for i in range(start + 1, start + count + 1)
+    ]
+
+
+def _counter_tail(
+    seed: int, start: int, count: int, k: int, top: bool, backend: str
+) -> list[float]:
+    """The ``k`` largest (``top``) or smallest counter-stream uniforms of one chunk of paths."""
+    u = counter_uniforms(seed, start, count, backend=backend)
+    if isinstance(u, list):
+        return heapq.nlargest(k, u) if top else heapq.nsmallest(k, u)
+    np = numpy_or_none()
+    if k < count:
+        u = np.partition(u, count - k)[count - k :] if top else np.partition(u, k - 1)[:k]
+    return u.tolist()
+
+
+def _var_mc_counter(
+    params: CreditParams, n_paths: int, seed: int, backend: str, chunk_size: int, workers: int
+) -> float:
+    idx = _quantile_index(params.alpha, n_paths)
+    top = n_paths - idx <= idx + 1
+    k = n_paths - idx if top else idx + 1
+    tasks = [
+        (seed, start, min(chunk_size, n_paths - start), k, top, backend)
+        for start in range(0, n_paths, chunk_size)
+    ]
+    if workers <= 1:
+        tails = [_counter_tail(*t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(workers) as ex:
+            tails = list(ex.map(_counter_tail, *zip(*tasks, strict=True)))
+    # Every chunk kept its k extreme draws, so the merged tail holds the global order statistic.
+    draws = (x for t in tails for x in t)
+    u_k = heapq.nlargest(k, draws)[-1] if top else heapq.nsmallest(k, draws)[-1]
+    return _loss_at_uniform(params, u_k)
+
+
+def _var_from_factors_numpy(np: Any, params: CreditParams, z: Any) -> float:
+    """Vectorized kernel: alpha-quantile of loss given an array of systematic factors ``z``.
+
+    The conditional default-rate arguments are computed in bulk; since Phi is monotone, the
+    quantile is selected with ``np.partition`` (O(n)) and Phi is applied to that element only,
+    which gives exactly the value of sorting the per-path losses.
+    """
+    nd = NormalDist()
+    x = np.asarray(z, dtype=np.float64) * math.sqrt(params.rho)
+    x += nd.inv_cdf(params.PD)
+    x /= math.sqrt(1.0 - params.rho)
+    idx = _quantile_index(params.alpha, x.shape[0])
+    x_k = float(np.partition(x, idx)[idx])
+    return params.E * params.LGD * nd.cdf(x_k)
+
+
+def _loss_slope(params: CreditParams, u: float) -> float:
+    """dL/du of ``_loss_at_uniform`` (used for the delta-method standard error)."""
+    nd = NormalDist()
+    z = nd.inv_cdf(u)
+    s = math.sqrt(1.0 - params.rho)
+    x = (nd.inv_cdf(params.PD) + math.sqrt(params.rho) * z) / s
+    return params.E * params.LGD * nd.pdf(x) * (math.sqrt(params.rho) / s) / nd.pdf(z)
+
+
+def _stratum_index(alpha: float, n_paths: int) -> int:
+    """Order statistic for stratified / sobol designs: the stratum [k/n, (k+1)/n) holding alpha.
+
+    Their sorted uniforms satisfy u_(k) ~ U[k/n, (k+1)/n), so this k puts alpha inside the
+    range of u_(k); ``_quantile_index`` would sit about one stratum below it.
+    """
+    return min(int(alpha * n_paths), n_paths - 1)
+
+
+def _uniform_quantile_sd(sampling: str, alpha: float, n_paths: int) -> float:
+    """Standard deviation of the selected uniform order statistic under each scheme."""
+    if sampling == "plain":
+        return math.sqrt(alpha * (1.0 - alpha) / n_paths)
+    if sampling == "antithetic":
+        # Per pair, #{u <= t} = 1 + 1{1-t <= u <= t}: only the central mass is random.
+        t = max(alpha, 1.0 - alpha)
+        return math.sqrt((2.0 * t - 1.0) * (1.0 - t) / n_paths)
+    if sampling == "stratified":
+        return 1.0 / (n_paths * math.sqrt(12.0))
+    # The first 2^k van der Corput points form a shifted lattice of spacing 2^-k.
+    return 1.0 / (2 ** (n_paths.bit_length() - 1) * math.sqrt(12.0))
+
+
+def var_mc_estimate(
+    params: CreditParams,
+    *,
+    n_paths: int = 50_000,
+    seed: int = 7,
+    sampling: str = "plain",
+    backend: str = "python",
+) -> McEstimate:
+    """VaR estimate plus the standard error of the quantile, for a chosen sampling scheme.
+
+    - ``plain``: i.i.d. uniforms (with the python backend the value equals ``var_mc``);
+    - ``antithetic``: pairs (u, 1-u);
+    - ``stratified``: one uniform in each of ``n_paths`` equal strata of (0, 1);
+    - ``sobol``: the first ``n_paths`` points of the one-dimensional Sobol sequence (base-2
+      van der Corput, which is also the first Halton dimension) under a random
+      Cranley-Patterson shift.
+
+    Loss is monotone in the factor's uniform draw, so the quantile is selected on the uniforms
+    and mapped through Phi^{-1} once. ``std_error`` is the delta-method error
+    sd(u_(k)) * dL/du, with sd(u_(k)) known for each design: sqrt(alpha(1-alpha)/n) for plain
+    sampling, 1/(n*sqrt(12)) for stratified and sobol. Antithetic pairing targets the mean,
+    not the tail, and gives little gain for VaR.
+
+    Stratified and sobol place exactly one draw per stratum of width 1/n, so u_(k) is uniform
+    on the stratum holding alpha (``_stratum_index``) and its mean sits up to half a stratum
+    off alpha. That offset is deterministic: ``bias`` reports it (in loss units) and
+    ``std_error`` is then the root-mean-square error sqrt(sd^2 + bias^2). ``sobol`` needs a
+    power-of-two ``n_paths``; only then do its points form such a lattice.
+    """
+    if sampling not in SAMPLING_SCHEMES:
+        raise ValueError(f"unknown sampling: {sampling!r} (expected one of {SAMPLING_SCHEMES})")
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend: {backend!r} (expected one of {BACKENDS})")
+    if sampling == "sobol" and n_paths & (n_paths - 1):
+        raise ValueError(f"sobol sampling needs a power-of-two n_paths, got {n_paths}.")
+
+    METRICS.incr("mc_paths", n_paths)
+    stratified = sampling in ("stratified", "sobol")
+    k = (
+        _stratum_index(params.alpha, n_paths)
+        if stratified
+        else _quantile_index(params.alpha, n_paths)
+    )
+    np = numpy_or_none() if backend == "numpy" else None
+    if np is not None:
+        u = _uniforms_numpy(np, sampling, n_paths, np.random.default_rng(seed))
+        u_k = float(np.partition(u, k)[k])
+    else:
+        u_k = sorted(_uniforms_python(sampling, n_paths, random.Random(seed)))[k]
+
+    sd_u = _uniform_quantile_sd(sampling, params.alpha, n_paths)
+    bias_u = (k + 0.5) / n_paths - params.alpha if stratified else 0.0
+    slope = _loss_slope(params, u_k)
+    return McEstimate(
+        value=_loss_at_uniform(params, u_k),
+        std_error=math.hypot(sd_u, bias_u) * slope,
+        n_paths=n_paths,
+        sampling=sampling,
+        bias=bias_u * slope,
+    )
+
+
+def var_mc(
+    params: CreditParams,
+    *,
+    n_paths: int = 50_000,
+    seed: int = 7,
+    backend: str = "python",
+    sampling: str = "plain",
+    streaming: bool = False,
+    chunk_size: int = STREAM_CHUNK,
+    stream: str = "sequential",
+    workers: int = 1,
+) -> float:
     """Monte Carlo estimate of VaR for an *infinitely granular* Vasicek portfolio.
 
     We simulate only the systematic factor Z ~ N(0,1). Conditional on Z, the default rate is
     q(Z) = Phi((Phi^{-1}(PD) + sqrt(rho)*Z)/sqrt(1-rho)).
     Loss is then L = E*LGD*q(Z).
+
+    ``backend="numpy"`` draws all factors at once from ``numpy.random.default_rng(seed)``
+    (reproducible per seed, but a different stream from ``random.Random(seed)``) and falls
+    back to the pure-Python loop when NumPy is not installed. Given the same factor draws
+    both backends return identical values (see ``tests/test_failure_modes.py``).
+
+    Any ``sampling`` other than ``"plain"`` is delegated to ``var_mc_estimate``.
+
+    ``streaming=True`` never materialises the ``n_paths`` losses. Loss is monotone in Z, so
+    the alpha-quantile of loss is the loss at the matching order statistic of the draws; that
+    order statistic is tracked with a bounded heap (python) or per-chunk selection over
+    ``chunk_size`` draws (numpy). Memory is O(n_paths * min(alpha, 1 - alpha)) and the result
+    is identical to the non-streaming value for the same seed and backend.
+
+    ``stream="counter"`` draws path i's uniform from ``counter_uniforms`` (a function of
+    (seed, i) only) instead of one serial generator. Paths are simulated in chunks of
+    ``chunk_size`` across ``workers`` processes, each chunk keeping only its tail, and the
+    result is bit-identical for every chunk size, worker count and backend.
     """
-    nd = NormalDist()
+    if stream not in STREAMS:
+        raise ValueError(f"unknown stream: {stream!r} (expected one of {STREAMS})")
+    if stream == "counter":
+        if sampling != "plain":
+            raise ValueError("counter streams support only plain sampling.")
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend: {backend!r} (expected one of {BACKENDS})")
+        METRICS.incr("mc_paths", n_paths)
+        return _var_mc_counter(params, n_paths, seed, backend, chunk_size, workers)
+    if workers > 1:
+        raise ValueError("workers > 1 needs stream='counter'.")
+    if sampling != "plain":
+        if streaming:
+            raise ValueError("streaming mode supports only plain sampling.")
+        return var_mc_estimate(
+            params, n_paths=n_paths, seed=seed, sampling=sampling, backend=backend
+        ).value
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend: {backend!r} (expected one of {BACKENDS})")
+    METRICS.incr("mc_paths", n_paths)
+    idx = _quantile_index(params.alpha, n_paths)
+    np = numpy_or_none() if backend == "numpy" else None
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        if streaming:
+            chunks = (
+                rng.standard_normal(min(chunk_size, n_paths - start))
+                for start in range(0, n_paths, chunk_size)
+            )
+            return _loss_at_factor(params, _streaming_order_stat_numpy(np, chunks, n_paths, idx))
+        return _var_from_factors_numpy(np, params, rng.standard_normal(n_paths))
+
     rnd = random.Random(seed)
+    if streaming:
+        draws = (rnd.random() for _ in range(n_paths))
+        return _loss_at_uniform(params, _streaming_order_stat(draws, n_paths, idx))
+
+    nd = NormalDist()
     pd_thresh = nd.inv_cdf(params.PD)
 
     losses = []
@@ -42,15 +414,153 @@ def var_mc(params: CreditParams, *, n_paths: int = 50_000, seed: int = 7) -> flo
         losses.append(params.E * params.LGD * q)
 
     losses.sort()
-    idx = int(params.alpha * (n_paths - 1))
     return float(losses[idx])
 
 
+@dataclass(frozen=True)
+class AdaptiveEstimate:
+    value: float
+    ci_low: float
+    ci_high: float
+    n_paths: int
+    converged: bool  # False when ``max_paths`` ran out before the interval was narrow enough
+
+    @property
+    def width(self) -> float:
+        return self.ci_high - self.ci_low
+
+
+def _order_stat_ci(n: int, alpha: float, confidence: float) -> tuple[int, int]:
+    """0-based ascending ranks (lo, hi) of the distribution-free interval for the
+    alpha-quantile: [X_(lo), X_(hi)] covers it with probability ~``confidence``."""
+    half = NormalDist().inv_cdf(0.5 + confidence / 2.0) * math.sqrt(n * alpha * (1.0 - alpha))
+    lo = max(math.floor(n * alpha - half), 1)
+    hi = min(math.ceil(n * alpha + half), n)
+    return lo - 1, hi - 1
+
+
+def var_mc_adaptive(
+    params: CreditParams,
+    *,
+    target_width: float,
+    seed: int = 7,
+    batch_paths: int = 5_000,
+    max_paths: int = 1_000_000,
+    confidence: float = 0.95,
+    backend: str = "python",
+    stream: str = "sequential",
+) -> AdaptiveEstimate:
+    """Plain Monte Carlo VaR, simulated in batches until its confidence interval is narrow.
+
+    After each batch of ``batch_paths`` the distribution-free order-statistic interval for
+    the alpha-quantile is formed (ranks n*alpha -/+ z*sqrt(n*alpha*(1-alpha))) and mapped to
+    loss; simulation stops once its width is at most ``target_width`` or ``max_paths`` is
+    reached. Only the upper tail of the uniform draws is kept (enough for the interval at
+    ``max_paths``), so memory is O(max_paths * (1 - alpha)).
+
+    With the python backend the draws are ``var_mc``'s stream, so ``value`` equals
+    ``var_mc(params, n_paths=result.n_paths, seed=seed)``. With ``stream="counter"`` batch
+    draws come from ``counter_uniforms`` and ``value`` equals ``var_mc`` with the counter
+    stream on either backend.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend: {backend!r} (expected one of {BACKENDS})")
+    if stream not in STREAMS:
+        raise ValueError(f"unknown stream: {stream!r} (expected one of {STREAMS})")
+    if target_width <= 0.0 or batch_paths < 1 or max_paths < batch_paths:
+        raise ValueError("need target_width > 0 and 1 <= batch_paths <= max_paths.")
+    alpha = params.alpha
+    keep = max_paths - _order_stat_ci(max_paths, alpha, confidence)[0] + 1
+    np = numpy_or_none() if backend == "numpy" else None
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        tail = np.empty(0)
+    else:
+        rnd = random.Random(seed)
+        tail = []
+
+    n = 0
+    while True:
+        m = min(batch_paths, max_paths - n)
+        METRICS.incr("mc_paths", m)
+        if stream == "counter":
+            fresh = counter_uniforms(seed, n, m, backend=backend)
+        else:
+            fresh = rng.random(m) if np is not None else [rnd.random() for _ in range(m)]
+        if np is not None:
+            tail = np.concatenate([tail, fresh])
+            if tail.shape[0] > keep:
+                tail = np.partition(tail, tail.shape[0] - keep)[-keep:]
+            desc = -np.sort(-tail)
+        else:
+            tail = desc = heapq.nlargest(keep, tail + fresh)
+        n += m
+        lo, hi = _order_stat_ci(n, alpha, confidence)
+        # Ascending rank i of n draws is position n - 1 - i of the descending tail.
+        ci_low = _loss_at_uniform(params, float(desc[n - 1 - lo]))
+        ci_high = _loss_at_uniform(params, float(desc[n - 1 - hi]))
+        converged = ci_high - ci_low <= target_width
+        if converged or n >= max_paths:
+            value = _loss_at_uniform(params, float(desc[n - 1 - _quantile_index(alpha, n)]))
+            return AdaptiveEstimate(value, ci_low, ci_high, n, converged)
+
+
 def var_with_sanity_check(
-    params: CreditParams, *, mc_paths: int = 50_000, seed: int = 7, max_gap: float = 5.0
+    params: CreditParams,
+    *,
+    mc_paths: int = 50_000,
+    seed: int = 7,
+    max_gap: float = 5.0,
+    backend: str = "python",
+    sampling: str = "plain",
+    target_width: Optional[float] = None,
+    max_paths: int = 1_000_000,
+    stats: Optional[dict] = None,
+    stream: str = "sequential",
 ) -> float:
+    """Analytic VaR, after checking a Monte Carlo estimate lands within ``max_gap`` of it.
+
+    With ``target_width`` the estimate is adaptive (``var_mc_adaptive`` in batches of
+    ``mc_paths``, plain sampling only): paths are added until the 95% interval for the
+    quantile is at most ``target_width`` wide (e.g. a fraction of ``max_gap``), up to
+    ``max_paths``. ``stats`` (if given) receives ``mc_paths`` (paths used) and ``mc_value``,
+    plus ``ci_low``/``ci_high``/``converged`` in adaptive mode. ``stream`` selects the
+    Monte Carlo stream (see ``var_mc``).
+    """
     analytic = var_analytic(params)
-    mc = var_mc(params, n_paths=mc_paths, seed=seed)
+    info: dict = {}
+    if target_width is None:
+        mc = var_mc(
+            params,
+            n_paths=mc_paths,
+            seed=seed,
+            backend=backend,
+            sampling=sampling,
+            stream=stream,
+        )
+        info.update(mc_paths=mc_paths, mc_value=mc)
+    else:
+        if sampling != "plain":
+            raise ValueError("adaptive mode supports only plain sampling.")
+        est = var_mc_adaptive(
+            params,
+            target_width=target_width,
+            seed=seed,
+            batch_paths=mc_paths,
+            max_paths=max_paths,
+            backend=backend,
+            stream=stream,
+        )
+        mc = est.value
+        info.update(
+            mc_paths=est.n_paths,
+            mc_value=mc,
+            ci_low=est.ci_low,
+            ci_high=est.ci_high,
+            converged=est.converged,
+        )
+    if stats is not None:
+        stats.update(info)
     if abs(mc - analytic) > max_gap:
         raise RuntimeError("Monte Carlo sanity-check too far from analytic VaR.")
     return analytic
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from econ_math_portfolio.solvers import brent, closed_form_root
+
 
 @dataclass(frozen=True)
 class HjbParams:
@@ -38,4 +40,6 @@ def rho_critical(params: HjbParams) -> float:
     rho = (-const) / (w**params.gamma)
     if F(rho, params) < -1e-10:
         raise RuntimeError("Verification failed: F(rho_critical) < 0.")
-    return rho
+    # F is linear in rho; in verify mode the root of F is also found iteratively.
+    lo, hi = rho - 1.0 - abs(rho), rho + 1.0 + abs(rho)
+    return closed_form_root(rho, lo, hi, lambda: brent(lambda r: F(r, params), lo, hi)).root
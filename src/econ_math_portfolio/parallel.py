@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[tuple[int, list[T]]]:
+    """Yield ``(start_index, chunk)`` pairs of at most ``size`` items, reading lazily.
+
+    Raises ValueError (on the call, before any item is read) if ``size`` < 1.
+    """
+    if size < 1:
+        raise ValueError(f"chunk size must be >= 1, got {size}")
+    return _chunks(iter(items), size)
+
+
+def _chunks(it: Iterator[T], size: int) -> Iterator[tuple[int, list[T]]]:
+    start = 0
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def imap_ordered(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    workers: int = 1,
+    max_pending: Optional[int] = None,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: Sequence[Any] = (),
+) -> Iterator[R]:
+    """Map ``func`` over ``items`` in a process pool, yielding results in input order.
+
+    At most ``max_pending`` (default ``2 * workers``) items are in flight: the input iterator
+    is only advanced once the oldest result has been yielded, so a huge input is never fully
+    buffered. ``initializer(*initargs)`` runs once per worker (in-process when workers <= 1).
+    """
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            yield func(item)
+        return
+
+    limit = max_pending or 2 * workers
+    with ProcessPoolExecutor(workers, initializer=initializer, initargs=tuple(initargs)) as ex:
+        pending: deque[Future[R]] = deque()
+        for item in items:
+            pending.append(ex.submit(func, item))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
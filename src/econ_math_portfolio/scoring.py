@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import json
+import math
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, TextIO, Tuple
+
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.tasks import TASKS, parse_variant, variant_id
+from econ_math_portfolio.utils.validate import result
 
 
 @dataclass(frozen=True)
@@ -15,10 +20,85 @@ class ScoreBreakdown:
     reasons: list[str]
 
 
+@dataclass(frozen=True, slots=True)
+class TaskRubric:
+    tolerance: float
+    require_explanation: bool
+    bounds: Optional[Tuple[float, float]]  # inclusive [min, max]; None when unbounded
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRubric:
+    """Validated, pre-cast form of ``rubric.json``; build once with ``compile_rubric``."""
+
+    w_format: float
+    w_numeric: float
+    w_reasoning: float
+    tasks: Mapping[str, TaskRubric]
+
+
 def load_rubric(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
+def _number(value: Any, where: str, *, minimum: float = -math.inf) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"rubric: {where} must be a number, got {value!r}")
+    x = float(value)
+    if math.isnan(x) or x < minimum:
+        raise ValueError(f"rubric: {where} must be >= {minimum}, got {value!r}")
+    return x
+
+
+def _section(value: Any, where: str) -> Mapping[str, Any]:
+    if not isinstance(value, dict):
+        raise ValueError(f"rubric: {where} must be an object")
+    return value
+
+
+def compile_rubric(rubric: Mapping[str, Any]) -> CompiledRubric:
+    """Validate a parsed rubric and freeze it; raises ``ValueError`` naming the bad field."""
+    scoring = _section(_section(rubric, "rubric").get("scoring"), "scoring")
+    cfg = _section(scoring.get("components"), "scoring.components")
+    weights = {}
+    for name in ("format", "numeric_correctness", "reasoning_quality"):
+        weights[name] = _number(cfg.get(name), f"scoring.components.{name}", minimum=0.0)
+        if math.isinf(weights[name]):
+            raise ValueError(f"rubric: scoring.components.{name} must be finite")
+
+    tasks: Dict[str, TaskRubric] = {}
+    for task_id, raw in _section(rubric.get("tasks"), "tasks").items():
+        where = f"tasks.{task_id}"
+        entry = _section(raw, where)
+        fmt = entry.get("expected_format", "float")
+        if fmt != "float":
+            raise ValueError(f"rubric: {where}.expected_format {fmt!r} is not supported")
+        tol = _number(entry.get("tolerance", 0.0), f"{where}.tolerance", minimum=0.0)
+        req = entry.get("require_explanation", False)
+        if not isinstance(req, bool):
+            raise ValueError(f"rubric: {where}.require_explanation must be true or false")
+        bounds = None
+        if entry.get("bounds") is not None:
+            b = _section(entry["bounds"], f"{where}.bounds")
+            lo = _number(b.get("min", -math.inf), f"{where}.bounds.min")
+            hi = _number(b.get("max", math.inf), f"{where}.bounds.max")
+            if lo > hi:
+                raise ValueError(f"rubric: {where}.bounds.min exceeds bounds.max")
+            bounds = (lo, hi)
+        tasks[str(task_id)] = TaskRubric(tol, req, bounds)
+
+    return CompiledRubric(
+        w_format=weights["format"],
+        w_numeric=weights["numeric_correctness"],
+        w_reasoning=weights["reasoning_quality"],
+        tasks=tasks,
+    )
+
+
+def load_compiled_rubric(path: Path) -> CompiledRubric:
+    return compile_rubric(load_rubric(path))
+
+
 def _coerce_float(x: Any) -> Tuple[Optional[float], str | None]:
     try:
         if isinstance(x, bool):
@@ -34,14 +114,13 @@ def score_submission(
     answer: Any,
     explanation: str | None,
     expected: float,
-    rubric: dict,
+    rubric: CompiledRubric | dict,
 ) -> ScoreBreakdown:
-    cfg = rubric["scoring"]["components"]
-    w_format = float(cfg["format"])
-    w_num = float(cfg["numeric_correctness"])
-    w_reason = float(cfg["reasoning_quality"])
+    """Score one submission. Pass a ``CompiledRubric``; a raw dict is compiled on every call."""
+    if not isinstance(rubric, CompiledRubric):
+        rubric = compile_rubric(rubric)
 
-    task_cfg = rubric["tasks"].get(task_id)
+    task_cfg = rubric.tasks.get(task_id)
     if task_cfg is None:
         return ScoreBreakdown(
             total=0.0,
@@ -60,14 +139,13 @@ def score_submission(
         numeric_score = 0.0
     else:
         format_score = 1.0
-        bounds = task_cfg.get("bounds")
+        bounds = task_cfg.bounds
         if bounds is not None and val is not None:
-            lo = float(bounds.get("min", float("-inf")))
-            hi = float(bounds.get("max", float("inf")))
+            lo, hi = bounds
             if not (lo <= val <= hi):
                 reasons.append(f"answer out of bounds [{lo}, {hi}]")
 
-        tol = float(task_cfg.get("tolerance", 0.0))
+        tol = task_cfg.tolerance
         abs_err = abs(val - expected) if val is not None else float("inf")
         if abs_err <= tol:
             numeric_score = 1.0
@@ -76,15 +154,18 @@ def score_submission(
             reasons.append(f"abs_error={abs_err} exceeds tolerance={tol}")
 
     reasoning_score = 0.0
-    req_exp = bool(task_cfg.get("require_explanation", False))
-    if req_exp and (not explanation or not explanation.strip()):
+    if task_cfg.require_explanation and (not explanation or not explanation.strip()):
         reasons.append("missing explanation")
         reasoning_score = 0.0
     else:
         if explanation and len(explanation.strip().split()) >= 8:
             reasoning_score = 1.0
 
-    total = (w_format * format_score) + (w_num * numeric_score) + (w_reason * reasoning_score)
+    total = (
+        (rubric.w_format * format_score)
+        + (rubric.w_numeric * numeric_score)
+        + (rubric.w_reasoning * reasoning_score)
+    )
     return ScoreBreakdown(
         total=round(total, 6),
         format_score=round(format_score, 6),
@@ -106,3 +187,121 @@ def to_json_dict(sb: ScoreBreakdown) -> Dict[str, Any]:
         "reasoning_score": sb.reasoning_score,
         "reasons": sb.reasons,
     }
+
+
+def iter_submissions(stream: TextIO) -> Iterator[Any]:
+    """Parse a JSONL stream lazily; blank lines are skipped, malformed lines yield ``None``."""
+    for line in stream:
+        if not line.strip():
+            continue
+        with METRICS.phase("json_parse"):
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError:
+                payload = None
+        yield payload
+
+
+def reference_key(payload: Mapping[str, Any]) -> str:
+    """What ``expected_for`` is called with for a submission: its variant id, else its task id.
+
+    Raises ValueError if the submission's ``variant`` is not a variant id of its task.
+    """
+    task_id = str(payload.get("task_id", "")).strip()
+    variant = payload.get("variant", None)
+    if variant is None:
+        return task_id
+    of_task, seed, index = parse_variant(variant)
+    if of_task != task_id:
+        raise ValueError(f"unknown variant: {variant!r}")
+    return variant_id(of_task, seed, index)
+
+
+def score_many(
+    submissions: Iterable[Any],
+    *,
+    rubric: CompiledRubric | dict,
+    expected_for: Callable[[str], float],
+    start: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """Score a stream of submission payloads against one rubric.
+
+    ``expected_for`` is called at most once per reference key (see ``reference_key``; only for
+    tasks present in the rubric). Results are yielded in input order, one dict per
+    submission, indexed from ``start``.
+    """
+    if not isinstance(rubric, CompiledRubric):
+        rubric = compile_rubric(rubric)
+    expected_cache: Dict[str, float] = {}
+    for index, payload in enumerate(submissions, start):
+        if not isinstance(payload, dict):
+            sb = ScoreBreakdown(
+                total=0.0,
+                format_score=0.0,
+                numeric_score=0.0,
+                reasoning_score=0.0,
+                reasons=["submission is not a JSON object"],
+            )
+            yield {"index": index, "task_id": None, "score": to_json_dict(sb)}
+            continue
+
+        task_id = str(payload.get("task_id", "")).strip()
+        explanation = payload.get("explanation", None)
+        expected = float("nan")
+        if task_id in rubric.tasks:
+            try:
+                key = reference_key(payload)
+            except ValueError as e:
+                sb = ScoreBreakdown(
+                    total=0.0,
+                    format_score=0.0,
+                    numeric_score=0.0,
+                    reasoning_score=0.0,
+                    reasons=[str(e)],
+                )
+                yield {"index": index, "task_id": task_id, "score": to_json_dict(sb)}
+                continue
+            if key not in expected_cache:
+                expected_cache[key] = float(expected_for(key))
+            expected = expected_cache[key]
+
+        with METRICS.phase("scoring"):
+            sb = score_submission(
+                task_id=task_id,
+                answer=payload.get("answer", None),
+                explanation=explanation if isinstance(explanation, str) else None,
+                expected=expected,
+                rubric=rubric,
+            )
+        METRICS.incr("submissions_scored")
+        yield {"index": index, "task_id": task_id, "score": to_json_dict(sb)}
+
+
+def validate_record(payload: Any, expected_for: Callable[[str], float]) -> Dict[str, Any]:
+    """Validate one ``{task_id, answer}`` record; bad records get ``ok: False`` and an error.
+
+    Valid records produce the same dict as the task's ``validate(answer, variant)``, with the
+    tolerance taken from the task registry and the reference from ``expected_for`` called
+    with the record's ``reference_key``.
+    """
+    if not isinstance(payload, dict):
+        return {"task_id": None, "ok": False, "error": "not a JSON object"}
+    task_id = str(payload.get("task_id", "")).strip()
+    if task_id not in TASKS:
+        return {"task_id": task_id, "ok": False, "error": "unknown task_id"}
+    answer = payload.get("answer", None)
+    if isinstance(answer, bool) or not isinstance(answer, (int, float, str)):
+        return {"task_id": task_id, "ok": False, "error": "answer is not a number"}
+    try:
+        value = float(answer)
+    except ValueError:
+        return {"task_id": task_id, "ok": False, "error": "answer is not a number"}
+    if not math.isfinite(value):  # "nan", "inf", 1e999: not an answer (nor valid JSON out)
+        return {"task_id": task_id, "ok": False, "error": "answer is not a number"}
+    try:
+        key = reference_key(payload)
+    except ValueError as e:
+        return {"task_id": task_id, "ok": False, "error": str(e)}
+    variant = None if key == task_id else key
+    with METRICS.phase("validate"):
+        return result(task_id, float(expected_for(key)), TASKS[task_id].tolerance, value, variant)
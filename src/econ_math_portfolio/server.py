@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from econ_math_portfolio import cache, solvers, variants
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.scoring import (
+    load_compiled_rubric,
+    reference_key,
+    score_many,
+    validate_record,
+)
+from econ_math_portfolio.tasks import TASKS, get_task, split_key, task_ids
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+_HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+@dataclass(frozen=True)
+class Request:
+    op: str
+    body: Any = None
+    id: Any = None  # echoed back on the JSON-lines transport
+    close: bool = False  # HTTP ``Connection: close`` (or HTTP/1.0 without keep-alive)
+
+
+def _init_worker(use_cache: bool, verify: bool, manifest: Optional[str] = None) -> None:
+    cache.set_enabled(use_cache)
+    solvers.set_verify(verify)
+    variants.set_manifest(manifest)
+
+
+def _reference(key: str) -> float:
+    # Runs in the executor: the validator import and any solve/simulation stay off the loop.
+    task_id, variant = split_key(key)
+    return float(import_module(get_task(task_id).module).expected(variant))
+
+
+class GradingServer:
+    """Warm grading daemon: rubric parsed once, reference values computed once per task.
+
+    Both transports share one dispatcher. Requests on a connection may be pipelined: each is
+    handled concurrently as soon as it is read (at most ``max_inflight`` per connection) and
+    responses are written back in request order.
+    """
+
+    def __init__(
+        self,
+        rubric_path: Path,
+        *,
+        workers: int = 1,
+        max_inflight: int = 64,
+        grace: float = 10.0,
+    ) -> None:
+        self.rubric = load_compiled_rubric(rubric_path)
+        self.max_inflight = max_inflight
+        self.grace = grace
+        self._pool = ProcessPoolExecutor(
+            max(1, workers),
+            initializer=_init_worker,
+            initargs=(cache.is_enabled(), solvers.verify_enabled(), variants.manifest_path()),
+        )
+        self._expected: Dict[str, asyncio.Future[float]] = {}
+        self._connections: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._unix_path: Optional[str] = None
+        self._ops: Dict[str, Callable[[Any], Awaitable[Any]]] = {
+            "health": self._op_health,
+            "tasks": self._op_tasks,
+            "reference": self._op_reference,
+            "score": self._op_score,
+            "validate": self._op_validate,
+            "score-batch": self._op_score_batch,
+            "validate-batch": self._op_validate_batch,
+            "shutdown": self._op_shutdown,
+        }
+
+    # -- lifecycle -------------------------------------------------------------------------
+
+    async def start(
+        self, *, unix: Optional[str] = None, host: str = "127.0.0.1", port: int = 8765
+    ) -> str:
+        """Bind the listener and return its address (``unix:PATH`` or ``http://HOST:PORT``)."""
+        if unix is not None:
+            self._server = await asyncio.start_unix_server(
+                self._on_jsonl, path=unix, limit=MAX_BODY_BYTES
+            )
+            self._unix_path = unix
+            return f"unix:{unix}"
+        self._server = await asyncio.start_server(self._on_http, host, port, limit=MAX_BODY_BYTES)
+        bound = self._server.sockets[0].getsockname()
+        return f"http://{bound[0]}:{bound[1]}"
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def serve_until_stopped(self) -> None:
+        """Serve until ``stop()`` (signal or ``shutdown`` op), then drain and clean up.
+
+        Shutdown stops accepting connections and reading new requests, lets in-flight requests
+        finish and flush (up to ``grace`` seconds), then shuts the executor down.
+        """
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # not the main thread, or no signal support on this platform
+        try:
+            await self._stopping.wait()
+        finally:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.remove_signal_handler(sig)
+                except (NotImplementedError, RuntimeError, ValueError):
+                    pass
+            if self._server is not None:
+                self._server.close()
+            if self._connections:
+                _, late = await asyncio.wait(set(self._connections), timeout=self.grace)
+                for task in late:
+                    task.cancel()
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            if self._unix_path is not None:
+                try:
+                    os.unlink(self._unix_path)
+                except OSError:
+                    pass
+
+    # -- dispatch --------------------------------------------------------------------------
+
+    async def handle(self, req: Request) -> Tuple[int, Any]:
+        if not req.op:
+            return 400, {"error": "malformed request"}
+        handler = self._ops.get(req.op)
+        if handler is None:
+            return 404, {"error": f"unknown op: {req.op!r}"}
+        METRICS.incr("server_requests")
+        try:
+            return 200, await handler(req.body)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:  # keep the daemon up; report the failure to this caller only
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def expected(self, key: str) -> float:
+        """Reference value for a task (or variant) id, computed once in the executor and shared
+        by all callers."""
+        fut = self._expected.get(key)
+        if fut is None:
+            fut = asyncio.get_running_loop().run_in_executor(self._pool, _reference, key)
+            self._expected[key] = fut
+        try:
+            # shield: a cancelled caller must not cancel the shared computation.
+            return await asyncio.shield(fut)
+        except Exception:
+            if self._expected.get(key) is fut:
+                del self._expected[key]  # let a later request retry
+            raise
+
+    async def _expected_map(self, payloads: list) -> Dict[str, float]:
+        needed = set()
+        for p in payloads:
+            if isinstance(p, dict) and str(p.get("task_id", "")).strip() in TASKS:
+                try:
+                    needed.add(reference_key(p))
+                except ValueError:
+                    pass  # reported per record by score_many / validate_record
+        keys = sorted(needed)
+        values = await asyncio.gather(*(self.expected(k) for k in keys))
+        return dict(zip(keys, values, strict=True))
+
+    async def _op_health(self, body: Any) -> Any:
+        return {"status": "ok", "warm": sorted(t for t, f in self._expected.items() if f.done())}
+
+    async def _op_tasks(self, body: Any) -> Any:
+        return {"tasks": task_ids()}
+
+    async def _op_reference(self, body: Any) -> Any:
+        task_id = body.get("task_id") if isinstance(body, dict) else body
+        if task_id not in TASKS:
+            raise ValueError(f"unknown task_id: {task_id!r}")
+        if isinstance(body, dict) and body.get("variant") is not None:
+            key = reference_key(body)
+            return {"task_id": task_id, "variant": key, "reference": await self.expected(key)}
+        return {"task_id": task_id, "reference": await self.expected(task_id)}
+
+    async def _op_score(self, body: Any) -> Any:
+        if not isinstance(body, dict):
+            raise ValueError("submission must be a JSON object")
+        expected = await self._expected_map([body])
+        res = next(score_many([body], rubric=self.rubric, expected_for=expected.__getitem__))
+        return {"task_id": res["task_id"], "score": res["score"]}
+
+    async def _op_validate(self, body: Any) -> Any:
+        expected = await self._expected_map([body])
+        return validate_record(body, expected.__getitem__)
+
+    async def _op_score_batch(self, body: Any) -> Any:
+        if not isinstance(body, list):
+            raise ValueError("batch body must be a JSON array")
+        expected = await self._expected_map(body)
+        results = score_many(body, rubric=self.rubric, expected_for=expected.__getitem__)
+        return {"results": list(results)}
+
+    async def _op_validate_batch(self, body: Any) -> Any:
+        if not isinstance(body, list):
+            raise ValueError("batch body must be a JSON array")
+        expected = await self._expected_map(body)
+        results = [
+            {"index": i, **validate_record(p, expected.__getitem__)} for i, p in enumerate(body)
+        ]
+        return {"results": results}
+
+    async def _op_shutdown(self, body: Any) -> Any:
+        # Deferred so this response is still written before connections wind down.
+        asyncio.get_running_loop().call_soon(self.stop)
+        return {"status": "shutting down"}
+
+    # -- connections -----------------------------------------------------------------------
+
+    async def _serve_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        read_request: Callable[[asyncio.StreamReader], Awaitable[Optional[Request]]],
+        encode: Callable[[Request, int, Any], bytes],
+    ) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections.add(task)
+        # Bounded queue of in-flight responses, oldest first: the writer awaits them in order,
+        # and a full queue stops the reader (backpressure on pipelining clients).
+        pending: asyncio.Queue = asyncio.Queue(self.max_inflight)
+        sender = asyncio.create_task(self._send_responses(pending, writer, encode))
+        stop = asyncio.ensure_future(self._stopping.wait())
+        try:
+            while not self._stopping.is_set():
+                read = asyncio.ensure_future(read_request(reader))
+                await asyncio.wait({read, stop}, return_when=asyncio.FIRST_COMPLETED)
+                if not read.done():
+                    read.cancel()
+                    break
+                try:
+                    req = read.result()
+                except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                    break
+                if req is None:
+                    break
+                await pending.put((req, asyncio.ensure_future(self.handle(req))))
+                if req.close:
+                    break
+        finally:
+            stop.cancel()
+            await pending.put(None)
+            try:
+                await sender
+            finally:
+                writer.close()
+                self._connections.discard(task)
+
+    async def _send_responses(
+        self,
+        pending: asyncio.Queue,
+        writer: asyncio.StreamWriter,
+        encode: Callable[[Request, int, Any], bytes],
+    ) -> None:
+        broken = False
+        while True:
+            item = await pending.get()
+            if item is None:
+                return
+            req, fut = item
+            status, body = await fut
+            if broken:
+                continue  # peer went away: keep draining so in-flight work is not orphaned
+            try:
+                writer.write(encode(req, status, body))
+                await writer.drain()
+            except ConnectionError:
+                broken = True
+
+    # JSON lines (Unix socket): {"id": ..., "op": ..., "body": ...} per line, in and out.
+
+    async def _on_jsonl(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await self._serve_connection(reader, writer, _read_jsonl_request, _encode_jsonl)
+
+    # HTTP/1.1 (localhost): ``POST /score``, ``GET /reference/<task_id>``, ... with keep-alive.
+
+    async def _on_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await self._serve_connection(reader, writer, _read_http_request, _encode_http)
+
+
+async def _read_jsonl_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    while True:
+        line = await reader.readline()
+        if not line:
+            return None
+        if line.strip():
+            break
+    try:
+        msg = json.loads(line)
+    except json.JSONDecodeError:
+        return Request(op="", body=None, id=None)
+    if not isinstance(msg, dict):
+        return Request(op="", body=None, id=None)
+    return Request(op=str(msg.get("op", "")), body=msg.get("body"), id=msg.get("id"))
+
+
+def _encode_jsonl(req: Request, status: int, body: Any) -> bytes:
+    msg = {"id": req.id, "status": status, "body": body}
+    return (json.dumps(msg, sort_keys=True) + "\n").encode("utf-8")
+
+
+async def _read_http_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise ValueError("malformed HTTP request line") from None
+    headers: Dict[str, str] = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = h.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", "0") or 0)
+    if not 0 <= length <= MAX_BODY_BYTES:
+        raise ValueError("bad Content-Length")
+    raw = await reader.readexactly(length) if length else b""
+
+    conn = headers.get("connection", "").lower()
+    close = conn == "close" or (version == "HTTP/1.0" and conn != "keep-alive")
+    path = target.split("?", 1)[0].strip("/")
+    op, _, arg = path.partition("/")
+    try:
+        body = json.loads(raw) if raw else (arg or None)
+    except json.JSONDecodeError:
+        return Request(op="", close=close)
+    if method not in ("GET", "POST"):
+        return Request(op="", close=close)
+    return Request(op=op, body=body, close=close)
+
+
+def _encode_http(req: Request, status: int, body: Any) -> bytes:
+    payload = json.dumps(body, sort_keys=True).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_HTTP_REASONS.get(status, 'Error')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'close' if req.close else 'keep-alive'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + payload
+
+
+def serve(
+    rubric_path: Path,
+    *,
+    unix: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    workers: int = 1,
+    max_inflight: int = 64,
+    grace: float = 10.0,
+) -> int:
+    """Run the daemon in the foreground (``econ-math-portfolio serve``) until shut down."""
+
+    async def main() -> None:
+        server = GradingServer(rubric_path, workers=workers, max_inflight=max_inflight, grace=grace)
+        address = await server.start(unix=unix, host=host, port=port)
+        sys.stderr.write(json.dumps({"listening": address}) + "\n")
+        sys.stderr.flush()
+        await server.serve_until_stopped()
+
+    asyncio.run(main())
+    return 0
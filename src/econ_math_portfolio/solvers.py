@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import math
+import os
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from econ_math_portfolio.metrics import METRICS
+
+TYPE_CHECKING = False  # stands in for typing.TYPE_CHECKING: importing typing costs CLI startup
+if TYPE_CHECKING:
+    from typing import Any
+
+METHODS = ("bisect", "brent", "newton")
+CLOSED_FORM = "closed_form"
+VERIFY_ENV = "ECON_MATH_PORTFOLIO_VERIFY"
+VERIFY_RTOL = 1e-9
+
+_verify = False
+
+
+@dataclass(frozen=True)
+class RootResult:
+    root: float
+    iterations: int
+    evaluations: int
+    derivative_evaluations: int
+    method: str
+    converged: bool
+
+
+class _Counted:
+    def __init__(self, f: Callable[[float], float]) -> None:
+        self.f = f
+        self.calls = 0
+
+    def __call__(self, x: float) -> float:
+        self.calls += 1
+        return self.f(x)
+
+
+def _check_bracket(f_lo: float, f_hi: float) -> None:
+    if f_lo * f_hi > 0:
+        raise ValueError("Root not bracketed: widen [lo, hi].")
+
+
+def bisect(
+    f: Callable[[float], float],
+    lo: float,
+    hi: float,
+    *,
+    iters: int = 200,
+    ftol: float = 1e-12,
+) -> RootResult:
+    """Plain bisection: stops at the first midpoint with |f(mid)| < ``ftol``."""
+    fc = _Counted(f)
+    f_lo = fc(lo)
+    _check_bracket(f_lo, fc(hi))
+    for i in range(1, iters + 1):
+        mid = 0.5 * (lo + hi)
+        f_mid = fc(mid)
+        if abs(f_mid) < ftol:
+            return RootResult(mid, i, fc.calls, 0, "bisect", True)
+        if f_lo * f_mid <= 0:
+            hi = mid
+        else:
+            lo = mid
+            f_lo = f_mid
+    return RootResult(0.5 * (lo + hi), iters, fc.calls, 0, "bisect", False)
+
+
+def brent(
+    f: Callable[[float], float],
+    lo: float,
+    hi: float,
+    *,
+    iters: int = 200,
+    ftol: float = 1e-12,
+    xtol: float = 2e-12,
+    rtol: float = 4 * 2.220446049250313e-16,
+) -> RootResult:
+    """Brent-Dekker: inverse quadratic / secant steps, falling back to bisection."""
+    fc = _Counted(f)
+    a, b = lo, hi
+    fa, fb = fc(a), fc(b)
+    _check_bracket(fa, fb)
+    if fa == 0.0:
+        return RootResult(a, 0, fc.calls, 0, "brent", True)
+    if fb == 0.0:
+        return RootResult(b, 0, fc.calls, 0, "brent", True)
+
+    c, fc_ = a, fa
+    d = e = b - a
+    for i in range(1, iters + 1):
+        if fb * fc_ > 0:
+            c, fc_ = a, fa
+            d = e = b - a
+        if abs(fc_) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc_ = fb, fc_, fb
+        tol = 2.0 * rtol * abs(b) + 0.5 * xtol
+        m = 0.5 * (c - b)
+        if abs(m) <= tol or abs(fb) < ftol:
+            return RootResult(b, i, fc.calls, 0, "brent", True)
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p = 2.0 * m * s
+                q = 1.0 - s
+            else:
+                q = fa / fc_
+                r = fb / fc_
+                p = s * (2.0 * m * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+            if 2.0 * p < min(3.0 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, m)
+        fb = fc(b)
+    return RootResult(b, iters, fc.calls, 0, "brent", False)
+
+
+def newton(
+    f: Callable[[float], float],
+    df: Callable[[float], float],
+    lo: float,
+    hi: float,
+    *,
+    x0: float | None = None,
+    iters: int = 200,
+    ftol: float = 1e-12,
+    xtol: float = 2e-12,
+) -> RootResult:
+    """Safeguarded Newton: Newton steps kept inside a shrinking sign-change bracket.
+
+    A step that leaves the bracket, or a zero derivative, is replaced by bisection, so the
+    method never does worse than bisection on a bracketed root.
+    """
+    fc = _Counted(f)
+    dfc = _Counted(df)
+    f_lo = fc(lo)
+    _check_bracket(f_lo, fc(hi))
+    x = 0.5 * (lo + hi) if x0 is None else min(max(x0, lo), hi)
+    for i in range(1, iters + 1):
+        fx = fc(x)
+        if abs(fx) < ftol:
+            return RootResult(x, i, fc.calls, dfc.calls, "newton", True)
+        if f_lo * fx <= 0:
+            hi = x
+        else:
+            lo, f_lo = x, fx
+        d = dfc(x)
+        x_new = x - fx / d if d != 0.0 else math.nan
+        if not lo < x_new < hi:
+            x_new = 0.5 * (lo + hi)
+        if abs(x_new - x) <= xtol:
+            return RootResult(x_new, i, fc.calls, dfc.calls, "newton", True)
+        x = x_new
+    return RootResult(x, iters, fc.calls, dfc.calls, "newton", False)
+
+
+def find_root(
+    f: Callable[[float], float],
+    lo: float,
+    hi: float,
+    *,
+    method: str = "bisect",
+    df: Callable[[float], float] | None = None,
+    iters: int = 200,
+) -> RootResult:
+    """Dispatch to one of ``METHODS``; ``newton`` needs ``df`` and otherwise uses ``brent``."""
+    if method not in METHODS:
+        raise ValueError(f"unknown method: {method!r} (expected one of {METHODS})")
+    if method == "newton" and df is not None:
+        res = newton(f, df, lo, hi, iters=iters)
+    elif method in ("newton", "brent"):
+        res = brent(f, lo, hi, iters=iters)
+    else:
+        res = bisect(f, lo, hi, iters=iters)
+    METRICS.incr("solver_iterations", res.iterations)
+    METRICS.incr("solver_evaluations", res.evaluations + res.derivative_evaluations)
+    return res
+
+
+def set_verify(enabled: bool) -> None:
+    """Cross-check every closed-form solution against its iterative solver (debug mode)."""
+    global _verify
+    _verify = bool(enabled)
+
+
+def verify_enabled() -> bool:
+    return _verify or os.environ.get(VERIFY_ENV, "") not in ("", "0")
+
+
+def closed_form_root(
+    root: float, lo: float, hi: float, iterative: Callable[[], RootResult]
+) -> RootResult:
+    """Wrap an analytic root as a ``RootResult`` without any iteration.
+
+    The root must lie in [lo, hi] (the same contract as a bracketed solve). In verify mode
+    ``iterative()`` is run as well and a disagreement beyond ``VERIFY_RTOL`` raises.
+    """
+    if not lo <= root <= hi:
+        raise ValueError("Root not bracketed: widen [lo, hi].")
+    if verify_enabled():
+        check = iterative()
+        if abs(check.root - root) > VERIFY_RTOL * max(1.0, abs(root)):
+            raise RuntimeError(
+                f"Verification failed: closed form {root!r} vs {check.method} {check.root!r}."
+            )
+    METRICS.incr("closed_form_solves")
+    return RootResult(root, 0, 0, 0, CLOSED_FORM, True)
+
+
+@dataclass(frozen=True)
+class BatchRoots:
+    """Array-in/array-out root-finding result.
+
+    ``values`` and ``ok`` are NumPy arrays (or lists on the pure-Python path) of the broadcast
+    input shape; ``values`` is NaN wherever ``ok`` is False (root not bracketed).
+    """
+
+    values: Any
+    ok: Any
+
+
+def broadcast_lists(*args: Any) -> list[list[float]]:
+    """Pure-Python broadcasting of scalars and equal-length sequences to lists."""
+    seqs = [list(a) if isinstance(a, Sequence) else None for a in args]
+    sizes = {len(s) for s in seqs if s is not None and len(s) != 1}
+    if len(sizes) > 1:
+        raise ValueError("batch inputs must be scalars or sequences of one common length.")
+    n = sizes.pop() if sizes else 1
+    out = []
+    for a, s in zip(args, seqs, strict=True):
+        if s is None:
+            out.append([float(a)] * n)
+        else:
+            out.append([float(x) for x in s] * (n if len(s) == 1 else 1))
+    return out
+
+
+def bisect_batch(
+    np: Any,
+    f: Callable[[Any], Any],
+    lo: Any,
+    hi: Any,
+    *,
+    iters: int = 200,
+    ftol: float = 1e-12,
+) -> BatchRoots:
+    """Vectorized bisection of an elementwise function ``f`` over arrays of brackets.
+
+    Mirrors the scalar loops in the models: an element stops at the first midpoint with
+    |f(mid)| < ``ftol``, otherwise returns the final midpoint. Elements whose bracket has no
+    sign change are masked out instead of raising.
+    """
+    lo, hi = (a.astype(np.float64) for a in np.broadcast_arrays(lo, hi))
+    f_lo = f(lo)
+    f_hi = f(hi)
+    ok = ~(f_lo * f_hi > 0)
+    lo, hi, f_lo = np.broadcast_arrays(lo, hi, f_lo)
+    lo, hi, f_lo = lo.copy(), hi.copy(), f_lo.copy()
+
+    done = ~ok
+    root = np.full(lo.shape, np.nan)
+    for _ in range(iters):
+        mid = 0.5 * (lo + hi)
+        f_mid = f(mid)
+        hit = ~done & (np.abs(f_mid) < ftol)
+        root[hit] = mid[hit]
+        done |= hit
+        if done.all():
+            break
+        left = f_lo * f_mid <= 0
+        hi = np.where(left, mid, hi)
+        lo = np.where(left, lo, mid)
+        f_lo = np.where(left, f_lo, f_mid)
+    else:
+        pending = ~done
+        root[pending] = 0.5 * (lo[pending] + hi[pending])
+    return BatchRoots(values=root, ok=ok)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import sqlite3
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional
+
+from econ_math_portfolio import __version__
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.scoring import (
+    CompiledRubric,
+    compile_rubric,
+    reference_key,
+    score_many,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    task_id TEXT,
+    score TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def result_key(payload: Mapping[str, Any], rubric: CompiledRubric, expected: float) -> str:
+    """Content address of one scoring result.
+
+    Covers everything the score depends on: the submission as submitted, the rubric entry
+    for its task, the component weights (they change every total), the reference value and
+    the package version. Editing one task's tolerance therefore invalidates only that task.
+    """
+    task_id = str(payload.get("task_id", "")).strip()
+    task = rubric.tasks.get(task_id)
+    blob = json.dumps(
+        {
+            "submission": payload,
+            "task": asdict(task) if task is not None else None,
+            "weights": [rubric.w_format, rubric.w_numeric, rubric.w_reasoning],
+            "expected": None if math.isnan(expected) else expected,
+            "version": __version__,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """SQLite table of scored submissions, keyed by ``result_key``.
+
+    WAL mode and a busy timeout let several batch workers share one file; each worker commits
+    per chunk (``commit``), so an interrupted run keeps everything scored so far.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = str(path)
+        self._conn = sqlite3.connect(self.path, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT score FROM results WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, key: str, task_id: str, score: Mapping[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (key, task_id, score) VALUES (?, ?, ?)",
+            (key, task_id, json.dumps(score, sort_keys=True)),
+        )
+
+    def get_meta(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_meta(self, name: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def last_rubric(self) -> Optional[dict]:
+        """The raw rubric recorded by the last run that scored into this store."""
+        raw = self.get_meta("rubric")
+        return None if raw is None else json.loads(raw)
+
+    def record_rubric(self, rubric: Mapping[str, Any]) -> None:
+        self.set_meta("rubric", json.dumps(rubric, sort_keys=True))
+        self.commit()
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> ResultStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _score_one(
+    index: int,
+    payload: Any,
+    rubric: CompiledRubric,
+    expected: float,
+    store: ResultStore,
+) -> tuple[Dict[str, Any], bool]:
+    """``(result, reused)`` for one payload, through the store when the payload is storable."""
+    key = None
+    if isinstance(payload, dict):
+        key = result_key(payload, rubric, expected)
+        score = store.get(key)
+        if score is not None:
+            METRICS.incr("store_hits")
+            task_id = str(payload.get("task_id", "")).strip()
+            return {"index": index, "task_id": task_id, "score": score}, True
+        METRICS.incr("store_misses")
+    res = next(score_many([payload], rubric=rubric, expected_for=lambda _: expected, start=index))
+    if key is not None:
+        store.put(key, res["task_id"], res["score"])
+    return res, False
+
+
+def _expected_lookup(
+    rubric: CompiledRubric, expected_for: Callable[[str], float]
+) -> Callable[[Any], float]:
+    cache: Dict[str, float] = {}
+
+    def lookup(payload: Any) -> float:
+        if not isinstance(payload, dict):
+            return math.nan
+        task_id = str(payload.get("task_id", "")).strip()
+        if task_id not in rubric.tasks:
+            return math.nan
+        try:
+            key = reference_key(payload)
+        except ValueError:
+            return math.nan  # scored as an unknown variant
+        if key not in cache:
+            cache[key] = float(expected_for(key))
+        return cache[key]
+
+    return lookup
+
+
+def score_many_stored(
+    submissions: Iterable[Any],
+    *,
+    rubric: CompiledRubric | dict,
+    expected_for: Callable[[str], float],
+    store: ResultStore,
+    start: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """``score_many`` that reuses stored results and stores new ones (output is identical)."""
+    if not isinstance(rubric, CompiledRubric):
+        rubric = compile_rubric(rubric)
+    expected = _expected_lookup(rubric, expected_for)
+    for index, payload in enumerate(submissions, start):
+        yield _score_one(index, payload, rubric, expected(payload), store)[0]
+    store.commit()
+
+
+def rescore(
+    submissions: Iterable[Any],
+    *,
+    old_rubric: CompiledRubric | dict,
+    rubric: CompiledRubric | dict,
+    expected_for: Callable[[str], float],
+    store: ResultStore,
+    stats: Optional[Dict[str, int]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Re-grade under ``rubric`` and yield ``{index, task_id, old, new}`` for changed scores.
+
+    Submissions whose task entry (and the weights) did not change keep their key and are
+    served from the store; only the rest are scored, under both rubrics if the old result is
+    not stored yet. ``stats`` (if given) is filled with records/reused/rescored/changed counts.
+    """
+    if not isinstance(old_rubric, CompiledRubric):
+        old_rubric = compile_rubric(old_rubric)
+    if not isinstance(rubric, CompiledRubric):
+        rubric = compile_rubric(rubric)
+    counts = stats if stats is not None else {}
+    counts.update(records=0, reused=0, rescored=0, changed=0)
+    old_expected = _expected_lookup(old_rubric, expected_for)
+    new_expected = _expected_lookup(rubric, expected_for)
+    for index, payload in enumerate(submissions):
+        counts["records"] += 1
+        new, reused = _score_one(index, payload, rubric, new_expected(payload), store)
+        counts["reused" if reused else "rescored"] += 1
+        old, _ = _score_one(index, payload, old_rubric, old_expected(payload), store)
+        if old["score"] != new["score"]:
+            counts["changed"] += 1
+            yield {
+                "index": index,
+                "task_id": new["task_id"],
+                "old": old["score"],
+                "new": new["score"],
+            }
+    store.commit()
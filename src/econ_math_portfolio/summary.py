@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+_COMPONENTS = ("total", "format_score", "numeric_score", "reasoning_score")
+
+
+def reason_kind(reason: str) -> str:
+    """Collapse a reason string to its kind, dropping the per-submission numbers in it.
+
+    ``"abs_error=0.3 exceeds tolerance=1e-05"`` -> ``"abs_error exceeds tolerance"``,
+    ``"answer out of bounds [0.0, 1.0]"`` -> ``"answer out of bounds"``,
+    ``"unknown task_id: foo"`` -> ``"unknown task_id"``. Histograms stay bounded this way.
+    """
+    if reason.startswith("abs_error="):
+        return "abs_error exceeds tolerance"
+    return reason.split(" [", 1)[0].split(":", 1)[0]
+
+
+def _group_key(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return json.dumps(value, sort_keys=True)  # lists/objects as metadata: group by their JSON
+
+
+class _Group:
+    __slots__ = ("count", "sums", "correct", "reasons")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sums = [0.0] * len(_COMPONENTS)
+        self.correct = 0
+        self.reasons: Dict[str, int] = {}
+
+
+class Summary:
+    """Single-pass aggregate of batch score records, grouped by task id (and one field).
+
+    Memory is one small accumulator per (task_id, group) pair plus one counter per reason
+    kind, independent of the number of records. ``add`` takes the records ``score-batch``
+    writes; with ``group_by`` the field is read from the record's top level.
+    """
+
+    __slots__ = ("group_by", "_groups")
+
+    def __init__(self, group_by: Optional[str] = None) -> None:
+        self.group_by = group_by
+        self._groups: Dict[Tuple[Any, Any], _Group] = {}
+
+    def add(self, record: Mapping[str, Any]) -> None:
+        group = _group_key(record.get(self.group_by)) if self.group_by else None
+        key = (record.get("task_id"), group)
+        g = self._groups.get(key)
+        if g is None:
+            g = self._groups[key] = _Group()
+        score = record.get("score") or {}
+        g.count += 1
+        for i, name in enumerate(_COMPONENTS):
+            g.sums[i] += float(score.get(name, 0.0))
+        if score.get("numeric_score") == 1.0:
+            g.correct += 1
+        for reason in score.get("reasons", ()):
+            kind = reason_kind(str(reason))
+            g.reasons[kind] = g.reasons.get(kind, 0) + 1
+
+    def add_all(self, records: Iterable[Mapping[str, Any]]) -> Summary:
+        for record in records:
+            self.add(record)
+        return self
+
+    def _row(self, g: _Group, top: Optional[int]) -> Dict[str, Any]:
+        reasons = sorted(g.reasons.items(), key=lambda kv: (-kv[1], kv[0]))[:top]
+        row: Dict[str, Any] = {"count": g.count, "accuracy": g.correct / g.count}
+        for name, total in zip(_COMPONENTS, g.sums, strict=True):
+            row[f"mean_{name}"] = total / g.count
+        row["reasons"] = dict(reasons)
+        return row
+
+    def to_json_dict(self, *, top: Optional[int] = None) -> Dict[str, Any]:
+        """Per-group rows (sorted by task id, then group) plus an ``overall`` row."""
+        overall = _Group()
+        groups: List[Dict[str, Any]] = []
+        for (task_id, group), g in sorted(
+            self._groups.items(), key=lambda kv: (str(kv[0][0]), str(kv[0][1]))
+        ):
+            head: Dict[str, Any] = {"task_id": task_id}
+            if self.group_by:
+                head[self.group_by] = group
+            groups.append({**head, **self._row(g, top)})
+            overall.count += g.count
+            overall.correct += g.correct
+            overall.sums = [a + b for a, b in zip(overall.sums, g.sums, strict=True)]
+            for kind, n in g.reasons.items():
+                overall.reasons[kind] = overall.reasons.get(kind, 0) + n
+        return {
+            "group_by": self.group_by,
+            "groups": groups,
+            "overall": self._row(overall, top) if overall.count else {"count": 0},
+        }
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections import namedtuple
+
+# ``collections`` is loaded at interpreter startup anyway; ``typing`` is not. ``module`` is
+# the validator module, imported only when the task is actually used.
+TaskInfo = namedtuple("TaskInfo", ["task_id", "title", "difficulty", "tolerance", "module"])
+
+
+# Static registry: listing tasks or looking one up never touches the filesystem or imports a
+# validator. Keep in sync with ``validators/`` and ``problems/`` (checked by the test suite).
+TASKS: dict[str, TaskInfo] = {
+    t.task_id: t
+    for t in (
+        TaskInfo(
+            "contract_stochastic_income",
+            "Optimal Consumption Under Stochastic Income (root solve + constraint)",
+            "hard",
+            1e-6,
+            "validators.contract_stochastic_income",
+        ),
+        TaskInfo(
+            "cpi_target_discount",
+            "CPI targeting discount via bisection",
+            "medium",
+            1e-5,
+            "validators.cpi_target_discount",
+        ),
+        TaskInfo(
+            "credit_var_quantile",
+            "Credit VaR 99.9% (Vasicek, infinitely granular) + MC sanity check",
+            "hard",
+            1e-6,
+            "validators.credit_var_quantile",
+        ),
+        TaskInfo(
+            "hjb_discount_threshold",
+            "HJB inequality critical discount rate",
+            "medium",
+            1e-6,
+            "validators.hjb_discount_threshold",
+        ),
+    )
+}
+
+
+def task_ids() -> list[str]:
+    return sorted(TASKS)
+
+
+def get_task(task_id: str) -> TaskInfo:
+    try:
+        return TASKS[task_id]
+    except KeyError:
+        raise KeyError(f"unknown task_id: {task_id!r}") from None
+
+
+# A variant is one seeded parameter set of a task, named ``"<task_id>:<seed>:<index>"``. Its
+# parameters are a pure function of the id (see ``variants``), so an id is all a submission
+# needs to carry. Anything that takes a task id as a reference key also takes a variant id.
+
+
+def variant_id(task_id: str, seed: int, index: int) -> str:
+    return f"{task_id}:{seed}:{index}"
+
+
+def parse_variant(variant: str) -> tuple[str, int, int]:
+    """``(task_id, seed, index)`` of a variant id; ValueError if malformed or of no known task."""
+    parts = variant.split(":") if isinstance(variant, str) else []
+    numbers = parts[1:] if len(parts) == 3 else []
+    if numbers and parts[0] in TASKS and all(x.isascii() and x.isdigit() for x in numbers):
+        return parts[0], int(parts[1]), int(parts[2])
+    raise ValueError(f"unknown variant: {variant!r}")
+
+
+def split_key(key: str) -> tuple[str, str | None]:
+    """``(task_id, variant)`` of a reference key: a task id, or a variant id (normalized)."""
+    if ":" not in key:
+        return key, None
+    task_id, seed, index = parse_variant(key)
+    return task_id, variant_id(task_id, seed, index)
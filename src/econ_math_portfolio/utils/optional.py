@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from types import ModuleType
+
+
+def numpy_or_none() -> ModuleType | None:
+    """Return the ``numpy`` module if installed, else ``None`` (numpy is an optional extra)."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+import math
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
 
-def result(task_id: str, expected: float, tol: float, answer: float) -> dict:
+from econ_math_portfolio.utils.optional import numpy_or_none
+
+TYPE_CHECKING = False  # as in ``solvers``: keeps typing off the validator import path
+if TYPE_CHECKING:
+    from typing import Any
+
+
+def result(
+    task_id: str, expected: float, tol: float, answer: float, variant: str | None = None
+) -> dict:
     ok = abs(answer - expected) <= tol
-    return {
+    out = {
         "task_id": task_id,
         "expected": expected,
         "tolerance": tol,
@@ -11,3 +23,58 @@ def result(task_id: str, expected: float, tol: float, answer: float) -> dict:
         "ok": bool(ok),
         "abs_error": float(abs(answer - expected)),
     }
+    if variant is not None:
+        out["variant"] = variant
+    return out
+
+
+@dataclass(frozen=True)
+class ManyResult:
+    """``validate_many`` output: one ``ok``/``abs_error`` entry per answer.
+
+    ``ok`` is a bool array and ``abs_error`` a float64 array (lists without NumPy); entry i
+    matches ``validate(answers[i])``. ``result(i)`` builds that dict for one row.
+    """
+
+    task_id: str
+    expected: float
+    tolerance: float
+    answer: Any
+    ok: Any
+    abs_error: Any
+    variant: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.ok)
+
+    @property
+    def n_ok(self) -> int:
+        if isinstance(self.ok, list):
+            return sum(self.ok)
+        return int(numpy_or_none().count_nonzero(self.ok))
+
+    def result(self, i: int) -> dict:
+        return result(self.task_id, self.expected, self.tolerance, self.answer[i], self.variant)
+
+
+def result_many(
+    task_id: str,
+    expected: float,
+    tol: float,
+    answers: Iterable[float],
+    variant: str | None = None,
+) -> ManyResult:
+    """``result`` for many answers to one task in one vectorized comparison."""
+    np = numpy_or_none()
+    if np is not None:
+        if isinstance(answers, (Sequence, np.ndarray)):
+            answer = np.asarray(answers, dtype=np.float64)
+        else:  # generators, sets, ...: ``asarray`` would build a 0-d object array
+            answer = np.fromiter(answers, np.float64)
+        abs_error = np.abs(answer - expected)
+        ok = abs_error <= tol  # NaN answers compare False, as in ``result``
+    else:
+        answer = [float(a) for a in answers]
+        abs_error = [math.fabs(a - expected) for a in answer]
+        ok = [e <= tol for e in abs_error]
+    return ManyResult(task_id, expected, tol, answer, ok, abs_error, variant)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from econ_math_portfolio.utils.optional import numpy_or_none
+
+# Binary variant table: the manifest of ``variants.generate`` as fixed-width records, read
+# through ``mmap``. Layout (little-endian, every section 8-byte aligned):
+#
+#   file header   magic, format, number of blocks
+#   per block     header (task id, seed, first index, count, data offset, tolerance, field
+#                 count, record size) followed by the parameter field names
+#   per block     ``count`` records: variant index (u64), params (f64 each), expected (f64),
+#                 tolerance (f64)
+#
+# A lookup reads the headers once and then one record at a computed offset; the rest of the
+# table is never touched (the OS pages in only what is read).
+MAGIC = b"EMPVTBL\x00"
+TABLE_FORMAT = 1
+
+_FILE_HEADER = struct.Struct("<8sII")
+_BLOCK_HEADER = struct.Struct("<48sQQQQdII")
+_FIELD_NAME = struct.Struct("<16s")
+_WRITE_BATCH = 1 << 16  # records packed per write
+
+
+def is_table(path: Path | str) -> bool:
+    """True if ``path`` starts with the binary table's magic (else it is a JSON manifest)."""
+    with open(path, "rb") as fh:
+        return fh.read(len(MAGIC)) == MAGIC
+
+
+@dataclass(frozen=True, slots=True)
+class _Block:
+    task_id: str
+    seed: int
+    start: int
+    count: int
+    offset: int
+    tolerance: float
+    fields: Tuple[str, ...]
+    record: struct.Struct
+
+
+def _record_struct(n_fields: int) -> struct.Struct:
+    return struct.Struct(f"<Q{n_fields + 2}d")
+
+
+def _pad(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _name(text: str, width: int) -> bytes:
+    raw = text.encode("ascii")
+    if len(raw) > width:
+        raise ValueError(f"variant table: name {text!r} is longer than {width} bytes")
+    return raw
+
+
+@dataclass(frozen=True)
+class VariantRecord:
+    variant: str
+    params: Dict[str, float]
+    expected: float
+    tolerance: float
+
+
+class VariantTable:
+    """Read-only, memory-mapped variant table.
+
+    ``expected``/``lookup`` are O(1) per variant id; ``records`` exposes one block as a
+    zero-copy NumPy structured array (a ``memoryview`` without NumPy).
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = str(path)
+        with open(self.path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._blocks = self._read_blocks()
+        except BaseException:
+            self._mm.close()  # bad or truncated header: don't leave the map open
+            raise
+
+    def _read_blocks(self) -> Dict[Tuple[str, int], _Block]:
+        magic, fmt, n_blocks = _FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != TABLE_FORMAT:
+            raise ValueError(f"{self.path}: not a variant table (format {TABLE_FORMAT})")
+        blocks: Dict[Tuple[str, int], _Block] = {}
+        pos = _FILE_HEADER.size
+        for _ in range(n_blocks):
+            task, seed, start, count, offset, tol, n_fields, size = _BLOCK_HEADER.unpack_from(
+                self._mm, pos
+            )
+            pos += _BLOCK_HEADER.size
+            fields = tuple(
+                _FIELD_NAME.unpack_from(self._mm, pos + i * _FIELD_NAME.size)[0]
+                .rstrip(b"\x00")
+                .decode("ascii")
+                for i in range(n_fields)
+            )
+            pos = _pad(pos + n_fields * _FIELD_NAME.size)
+            record = _record_struct(n_fields)
+            if record.size != size:
+                raise ValueError(f"{self.path}: bad record size in block {task!r}")
+            task_id = task.rstrip(b"\x00").decode("ascii")
+            blocks[(task_id, seed)] = _Block(
+                task_id, seed, start, count, offset, tol, fields, record
+            )
+        return blocks
+
+    def blocks(self) -> List[Tuple[str, int]]:
+        return list(self._blocks)
+
+    def __len__(self) -> int:
+        return sum(b.count for b in self._blocks.values())
+
+    def _locate(self, task_id: str, seed: int, index: int) -> Optional[Tuple[_Block, tuple]]:
+        block = self._blocks.get((task_id, seed))
+        if block is None or not 0 <= index - block.start < block.count:
+            return None
+        row = block.record.unpack_from(
+            self._mm, block.offset + (index - block.start) * block.record.size
+        )
+        if row[0] != index:
+            raise ValueError(f"{self.path}: corrupt record for {task_id}:{seed}:{index}")
+        return block, row
+
+    def expected(self, task_id: str, seed: int, index: int) -> Optional[float]:
+        """The reference of one variant, or ``None`` if the table does not list it."""
+        found = self._locate(task_id, seed, index)
+        return None if found is None else found[1][-2]
+
+    def lookup(self, task_id: str, seed: int, index: int) -> Optional[VariantRecord]:
+        found = self._locate(task_id, seed, index)
+        if found is None:
+            return None
+        block, row = found
+        return VariantRecord(
+            variant=f"{task_id}:{seed}:{index}",
+            params=dict(zip(block.fields, row[1:-2], strict=True)),
+            expected=row[-2],
+            tolerance=row[-1],
+        )
+
+    def records(self, task_id: str, seed: int) -> Any:
+        """All records of one block, as a view onto the mapped file (no copy)."""
+        block = self._blocks[(task_id, seed)]
+        np = numpy_or_none()
+        if np is None:
+            end = block.offset + block.count * block.record.size
+            return memoryview(self._mm)[block.offset : end]
+        columns = ["index", *block.fields, "expected", "tolerance"]
+        dtype = np.dtype([(c, "<u8" if c == "index" else "<f8") for c in columns])
+        return np.frombuffer(self._mm, dtype=dtype, count=block.count, offset=block.offset)
+
+    def to_blocks(self) -> List[dict]:
+        """The table as manifest blocks (``variants.write_manifest`` input)."""
+        out = []
+        for block in self._blocks.values():
+            rows = []
+            for i in range(block.count):
+                row = block.record.unpack_from(self._mm, block.offset + i * block.record.size)
+                rows.append([*row[1:-1]])
+            out.append(
+                {
+                    "task_id": block.task_id,
+                    "seed": block.seed,
+                    "start": block.start,
+                    "tolerance": block.tolerance,
+                    "fields": list(block.fields),
+                    "rows": rows,
+                }
+            )
+        return out
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> VariantTable:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def write_table(blocks: Sequence[dict], path: Path | str) -> None:
+    """Write manifest blocks (``variants.generate`` output) as a binary variant table."""
+    headers = []
+    pos = _FILE_HEADER.size
+    for b in blocks:
+        pos = _pad(pos + _BLOCK_HEADER.size + len(b["fields"]) * _FIELD_NAME.size)
+    for b in blocks:
+        record = _record_struct(len(b["fields"]))
+        headers.append((b, record, pos))
+        pos = _pad(pos + len(b["rows"]) * record.size)
+
+    with open(path, "wb") as fh:
+        fh.write(_FILE_HEADER.pack(MAGIC, TABLE_FORMAT, len(blocks)))
+        for b, record, offset in headers:
+            header = _BLOCK_HEADER.pack(
+                _name(b["task_id"], 48),
+                b["seed"],
+                b["start"],
+                len(b["rows"]),
+                offset,
+                b["tolerance"],
+                len(b["fields"]),
+                record.size,
+            )
+            names = b"".join(_FIELD_NAME.pack(_name(f, _FIELD_NAME.size)) for f in b["fields"])
+            fh.write(header + names)
+            fh.write(b"\x00" * (_pad(fh.tell()) - fh.tell()))
+        for b, record, offset in headers:
+            fh.write(b"\x00" * (offset - fh.tell()))
+            tol, start, rows = b["tolerance"], b["start"], b["rows"]
+            for lo in range(0, len(rows), _WRITE_BATCH):
+                batch = rows[lo : lo + _WRITE_BATCH]
+                fh.write(
+                    b"".join(record.pack(start + lo + i, *row, tol) for i, row in enumerate(batch))
+                )
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+from dataclasses import astuple, fields
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from econ_math_portfolio import __version__
+from econ_math_portfolio.cache import cached_reference
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.models.contract_stochastic_income import (
+    ContractParams,
+    c_high_closed_form,
+)
+from econ_math_portfolio.models.cpi_target_discount import CpiParams, t_closed_form
+from econ_math_portfolio.models.credit_var_quantile import CreditParams
+from econ_math_portfolio.models.hjb_discount_threshold import HjbParams, rho_critical
+from econ_math_portfolio.tasks import TASKS, get_task, parse_variant, variant_id
+from econ_math_portfolio.variant_table import VariantTable, is_table, write_table
+
+VARIANTS_ENV = "ECON_MATH_PORTFOLIO_VARIANTS"
+MANIFEST_FORMAT = 1
+
+_manifest_path: Optional[str] = None
+# manifest path -> a VariantTable (binary), or the JSON manifest's blocks by "task_id:seed"
+_loaded: Dict[str, Any] = {}
+
+
+def _uniform(rng: random.Random, lo: float, hi: float, digits: int) -> float:
+    # Rounded so that a variant's parameters read well in a problem statement.
+    return round(rng.uniform(lo, hi), digits)
+
+
+def _sample_contract(rng: random.Random) -> ContractParams:
+    while True:
+        params = ContractParams(
+            delta=_uniform(rng, 0.85, 0.99, 3),
+            V0=_uniform(rng, 1.0, 6.0, 2),
+            c_low=_uniform(rng, 0.5, 1.2, 2),
+            autarky_high=_uniform(rng, 1.0, 1.5, 2),
+        )
+        if 1e-8 <= c_high_closed_form(params) <= 10.0:  # the validator's bracket
+            return params
+
+
+def _sample_cpi(rng: random.Random) -> CpiParams:
+    while True:
+        EI_a, EI_b = _uniform(rng, 150.0, 250.0, 1), _uniform(rng, 80.0, 120.0, 1)
+        base_c, price_c = _uniform(rng, 2.5, 4.0, 2), _uniform(rng, 8.0, 12.0, 2)
+        discount_coeff = _uniform(rng, 0.1, 0.4, 3)
+        # Target the CPI of a discount drawn inside (0, 1), so solve_t's bracket holds a root.
+        t = rng.uniform(0.05, 0.95)
+        ei_c = price_c * (1.0 - discount_coeff * t) / base_c * 100.0
+        params = CpiParams(
+            EI_a, EI_b, base_c, price_c, discount_coeff, round((EI_a + EI_b + ei_c) / 3.0, 2)
+        )
+        if 0.0 <= t_closed_form(params) <= 1.0:
+            return params
+
+
+def _sample_credit(rng: random.Random) -> CreditParams:
+    return CreditParams(
+        E=_uniform(rng, 50.0, 500.0, 0),
+        LGD=_uniform(rng, 0.2, 0.9, 2),
+        PD=_uniform(rng, 0.001, 0.1, 4),  # inside (0, 1): inv_cdf(PD) is finite
+        rho=_uniform(rng, 0.05, 0.5, 2),  # inside (0, 1): sqrt(1 - rho) > 0
+        alpha=rng.choice((0.99, 0.995, 0.999)),
+    )
+
+
+def _sample_hjb(rng: random.Random) -> HjbParams:
+    while True:
+        params = HjbParams(
+            b=_uniform(rng, 0.5, 2.0, 2),
+            sigma=_uniform(rng, 0.1, 0.5, 2),
+            gamma=_uniform(rng, 0.3, 0.9, 2),
+            x=_uniform(rng, 0.0, 1.0, 2),
+            y=_uniform(rng, 0.5, 2.0, 2),
+            p=_uniform(rng, 0.5, 2.0, 2),
+        )
+        if math.isfinite(rho_critical(params)):  # w = x + p*y > 0 by the ranges above
+            return params
+
+
+# Per task: draws one valid parameter set. Keep in sync with ``tasks.TASKS``.
+SAMPLERS: Dict[str, Callable[[random.Random], Any]] = {
+    "contract_stochastic_income": _sample_contract,
+    "cpi_target_discount": _sample_cpi,
+    "credit_var_quantile": _sample_credit,
+    "hjb_discount_threshold": _sample_hjb,
+}
+
+
+def variant_params(variant: str) -> Any:
+    """The parameter set of a variant id: a pure function of ``(task_id, seed, index)``."""
+    task_id, seed, index = parse_variant(variant)
+    # A str seed is hashed with SHA-512, so this is stable across processes and platforms.
+    return SAMPLERS[task_id](random.Random(variant_id(task_id, seed, index)))
+
+
+def set_manifest(path: Optional[str]) -> None:
+    """Look variant references up in this manifest first (``None``: only ``$VARIANTS_ENV``)."""
+    global _manifest_path
+    _manifest_path = None if path is None else str(path)
+    for source in _loaded.values():
+        if isinstance(source, VariantTable):
+            source.close()
+    _loaded.clear()
+
+
+def manifest_path() -> Optional[str]:
+    return _manifest_path or os.environ.get(VARIANTS_ENV) or None
+
+
+def _source(path: str) -> Any:
+    if path not in _loaded:
+        with METRICS.phase("manifest_load"):
+            if is_table(path):
+                # Only the headers are read here; lookups touch one record each.
+                _loaded[path] = VariantTable(path)
+            else:
+                manifest = load_manifest(Path(path))
+                _loaded[path] = {f"{b['task_id']}:{b['seed']}": b for b in manifest["variants"]}
+    return _loaded[path]
+
+
+def manifest_reference(variant: str) -> Optional[float]:
+    """A variant's reference from the configured manifest (a JSON manifest or a binary
+    variant table), or ``None`` if it is not listed."""
+    path = manifest_path()
+    if path is None:
+        return None
+    task_id, seed, index = parse_variant(variant)
+    source = _source(path)
+    if isinstance(source, VariantTable):
+        return source.expected(task_id, seed, index)
+    block = source.get(f"{task_id}:{seed}")
+    if block is None or not 0 <= index - block["start"] < len(block["rows"]):
+        return None
+    return float(block["rows"][index - block["start"]][-1])
+
+
+def variant_reference(
+    task_id: str,
+    variant: str,
+    settings: Mapping[str, Any],
+    compute: Callable[[Any], float],
+) -> float:
+    """Reference value of a variant: the manifest, else ``compute(params)`` via the disk cache.
+
+    Raises ValueError if ``variant`` is not a variant id of ``task_id``.
+    """
+    if parse_variant(variant)[0] != task_id:
+        raise ValueError(f"unknown variant: {variant!r} is not a {task_id} variant")
+    value = manifest_reference(variant)
+    if value is not None:
+        METRICS.incr("manifest_hits")
+        return value
+    params = variant_params(variant)
+    return cached_reference(task_id, params, settings, lambda: compute(params))
+
+
+def _reference_chunk(item: tuple[str, List[Any]]) -> List[float]:
+    task_id, params = item
+    validator = import_module(get_task(task_id).module)
+    return [float(validator.reference_compute(p)) for p in params]
+
+
+def generate(
+    task_id: str,
+    count: int,
+    *,
+    seed: int,
+    start: int = 0,
+    workers: int = 1,
+    chunk_size: int = 64,
+) -> dict:
+    """Manifest block for variants ``start .. start+count-1`` of ``task_id`` under ``seed``.
+
+    Validators that define ``reference_compute_batch`` get all references from one vectorized
+    call; the others are computed per variant in a pool of ``workers`` processes. Rows are the
+    parameter values in ``fields`` order followed by the reference.
+    """
+    from econ_math_portfolio.parallel import chunked, imap_ordered
+
+    if seed < 0 or start < 0 or count < 0:
+        # Variant ids (and the binary table's u64 fields) hold non-negative integers only.
+        raise ValueError(f"{task_id}: seed, start and count must be >= 0")
+    validator = import_module(get_task(task_id).module)
+    params = [variant_params(variant_id(task_id, seed, i)) for i in range(start, start + count)]
+    with METRICS.phase("reference_compute"):
+        batch = getattr(validator, "reference_compute_batch", None)
+        if batch is not None:
+            refs = [float(v) for v in batch(params)]
+        else:
+            items = ((task_id, chunk) for _, chunk in chunked(params, chunk_size))
+            chunks = imap_ordered(_reference_chunk, items, workers=workers)
+            refs = [v for chunk in chunks for v in chunk]
+    bad = [start + i for i, v in enumerate(refs) if not math.isfinite(v)]
+    if bad:
+        raise RuntimeError(f"{task_id}: no reference for variant index {bad[0]}")
+    return {
+        "task_id": task_id,
+        "seed": seed,
+        "start": start,
+        "tolerance": TASKS[task_id].tolerance,
+        "fields": [f.name for f in fields(params[0])] if params else [],
+        "rows": [[*astuple(p), v] for p, v in zip(params, refs, strict=True)],
+    }
+
+
+def write_manifest(blocks: Sequence[dict], path: Path) -> None:
+    manifest = {"format": MANIFEST_FORMAT, "version": __version__, "variants": list(blocks)}
+    path.write_text(json.dumps(manifest, separators=(",", ":")) + "\n", encoding="utf-8")
+
+
+def load_manifest(path: Path) -> dict:
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(manifest, dict) or manifest.get("format") != MANIFEST_FORMAT:
+        raise ValueError(f"{path}: not a variant manifest (format {MANIFEST_FORMAT})")
+    return manifest
+
+
+def convert(src: Path, dst: Path) -> str:
+    """Convert a JSON manifest to a binary variant table or back; returns the format written."""
+    if is_table(src):
+        with VariantTable(src) as table:
+            write_manifest(table.to_blocks(), dst)
+        return "json"
+    write_table(load_manifest(src)["variants"], dst)
+    return "binary"
@@ -0,0 +1,22 @@
+import pytest
+
+from econ_math_portfolio import cache, solvers, variants
+from econ_math_portfolio.cache import CACHE_DIR_ENV
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_reference_cache(tmp_path_factory):
+    # Keep the suite hermetic: never read or write the user's reference cache.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv(CACHE_DIR_ENV, str(tmp_path_factory.mktemp("reference-cache")))
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_flags():
+    # ``main(["--no-cache", ...])`` / ``--verify`` / ``--variants`` flip process-wide
+    # switches; undo them.
+    yield
+    cache.set_enabled(True)
+    solvers.set_verify(False)
+    variants.set_manifest(None)
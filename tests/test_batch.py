@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from econ_math_portfolio.cli import main
+from econ_math_portfolio.parallel import chunked, imap_ordered
+
+
+def _square(x):
+    return x * x
+
+
+def test_imap_ordered_preserves_order_with_bounded_lookahead():
+    consumed = []
+
+    def items():
+        for i in range(50):
+            consumed.append(i)
+            yield i
+
+    results = imap_ordered(_square, items(), workers=2, max_pending=4)
+    assert next(results) == 0
+    assert len(consumed) <= 4
+    assert list(results) == [i * i for i in range(1, 50)]
+
+
+def test_chunked_tracks_start_indices():
+    assert list(chunked(range(5), 2)) == [(0, [0, 1]), (2, [2, 3]), (4, [4])]
+    for size in (0, -1):
+        with pytest.raises(ValueError, match="chunk size"):
+            chunked(range(5), size)
+
+
+@pytest.mark.parametrize(
+    "flag,value", [("--chunk-size", "0"), ("--chunk-size", "-3"), ("--workers", "-1")]
+)
+def test_batch_commands_reject_bad_chunk_size_and_workers(tmp_path, capsys, flag, value):
+    subs = tmp_path / "subs.jsonl"
+    subs.write_text('{"task_id": "cpi_target_discount", "answer": 0.26}\n')
+    for cmd in ("score-batch", "validate-batch"):
+        with pytest.raises(SystemExit) as exc:
+            main([cmd, str(subs), flag, value])
+        assert exc.value.code == 2
+        assert "must be >=" in capsys.readouterr().err
+
+
+def test_score_batch_output_is_identical_across_worker_counts(tmp_path, capsys):
+    subs = tmp_path / "subs.jsonl"
+    records = [
+        {"task_id": "cpi_target_discount", "answer": 0.2619047619047619},
+        {"task_id": "hjb_discount_threshold", "answer": "bad"},
+        {"task_id": "nope", "answer": 1.0},
+    ] * 7
+    subs.write_text("\n".join(json.dumps(r) for r in records) + "\nnot json\n")
+
+    outputs = []
+    for workers in ("1", "2"):
+        assert main(["score-batch", str(subs), "--workers", workers, "--chunk-size", "4"]) == 0
+        outputs.append(capsys.readouterr().out)
+    assert outputs[0] == outputs[1]
+    lines = [json.loads(x) for x in outputs[0].splitlines()]
+    assert [r["index"] for r in lines] == list(range(len(records) + 1))
+    assert lines[0]["score"]["numeric_score"] == 1.0
+
+
+def test_validate_batch_reports_errors_per_record(tmp_path, capsys):
+    subs = tmp_path / "answers.jsonl"
+    subs.write_text(
+        '{"task_id": "cpi_target_discount", "answer": 0.2619047619047619}\n'
+        '{"task_id": "cpi_target_discount", "answer": true}\n'
+        '{"task_id": "__init__", "answer": 1.0}\n'
+    )
+    assert main(["validate-batch", str(subs), "--workers", "2", "--chunk-size", "1"]) == 0
+    lines = [json.loads(x) for x in capsys.readouterr().out.splitlines()]
+    assert [r["ok"] for r in lines] == [True, False, False]
+    assert lines[2]["error"] == "unknown task_id"
+
+
+def _reject_constant(name):
+    raise ValueError(f"not strict JSON: {name}")
+
+
+def test_validate_reads_many_answers_and_streams_one_line_each(tmp_path, capsys):
+    from econ_math_portfolio.cli import cmd_validate_many
+
+    answers = tmp_path / "answers.txt"
+    answers.write_text("0.2619047619047619 0.3\n\nnot-a-number\n0.26190476 nan -inf\n")
+    assert cmd_validate_many("cpi_target_discount", str(answers), block=3) == 2
+    captured = capsys.readouterr()
+    lines = [json.loads(x, parse_constant=_reject_constant) for x in captured.out.splitlines()]
+    assert [r["index"] for r in lines] == [0, 1, 2, 3, 4, 5]
+    assert [r["ok"] for r in lines] == [True, False, False, True, False, False]
+    assert lines[2] == {"index": 2, "answer": None, "ok": False, "error": "answer is not a number"}
+    summary = json.loads(captured.err)
+    assert (summary["count"], summary["ok"]) == (6, 2)
+
+    answers.write_text("0.2619047619047619\n")
+    assert main(["validate", "cpi_target_discount", "--answers", str(answers)]) == 0
+    assert main(["validate", "cpi_target_discount", "0.26", "--answers", str(answers)]) == 1
+
+
+def test_validate_batch_rejects_non_finite_answers_with_strict_json(tmp_path, capsys):
+    subs = tmp_path / "answers.jsonl"
+    subs.write_text(
+        '{"task_id": "cpi_target_discount", "answer": "nan"}\n'
+        '{"task_id": "cpi_target_discount", "answer": "inf"}\n'
+        '{"task_id": "cpi_target_discount", "answer": 1e999}\n'
+        '{"task_id": "cpi_target_discount", "answer": 0.2619047619047619}\n'
+    )
+    assert main(["validate-batch", str(subs)]) == 0
+    lines = [
+        json.loads(x, parse_constant=_reject_constant) for x in capsys.readouterr().out.splitlines()
+    ]
+    assert [r.get("error") for r in lines] == ["answer is not a number"] * 3 + [None]
+    assert [r["ok"] for r in lines] == [False, False, False, True]
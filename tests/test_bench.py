@@ -0,0 +1,24 @@
+from econ_math_portfolio.bench import BenchResult, find_regressions, run_benchmarks, to_json_dict
+
+
+def test_run_benchmarks_filter_emits_machine_readable_report():
+    results = run_benchmarks(quick=True, select="solve_t[closed_form]")
+    assert [r.name for r in results] == ["solve_t[closed_form]"]
+    report = to_json_dict(results)
+    assert report["results"]["solve_t[closed_form]"] > 0
+
+
+def test_find_regressions_applies_threshold_and_ignores_new_cases():
+    results = [BenchResult("a", 1.3, 1, 1), BenchResult("b", 1.1, 1, 1), BenchResult("c", 9, 1, 1)]
+    regressions = find_regressions(results, {"a": 1.0, "b": 1.0}, threshold=0.25)
+    assert [r["name"] for r in regressions] == ["a"]
+
+
+def test_case_arguments_match_their_labels(monkeypatch):
+    from econ_math_portfolio.models import credit_tail
+
+    seen = []
+    monkeypatch.setattr(credit_tail, "tail_curve", lambda p, n_paths: seen.append(n_paths))
+    results = run_benchmarks(quick=True, select="tail_curve")
+    assert [r.name for r in results] == ["tail_curve[3 alphas,n=5000]"]
+    assert set(seen) == {5000}
@@ -0,0 +1,62 @@
+from econ_math_portfolio import cache
+from econ_math_portfolio.models.cpi_target_discount import CpiParams
+
+
+def test_cached_reference_hits_disk_after_first_compute(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 0.125
+
+    settings = {"iters": 200}
+    assert cache.cached_reference("t", CpiParams(), settings, compute) == 0.125
+    assert cache.cached_reference("t", CpiParams(), settings, compute) == 0.125
+    assert len(calls) == 1
+
+    assert cache.clear() == 1
+    assert cache.cached_reference("t", CpiParams(), settings, compute) == 0.125
+    assert len(calls) == 2
+
+
+def test_clear_removes_only_cache_files(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    cache.cached_reference("t", CpiParams(), {}, lambda: 1.0)
+    (tmp_path / ".tmp-abc123.json").write_text("{")
+    keep = ["config.json", f"{'A' * 64}.json", f"{'a' * 63}.json", f"{'a' * 64}.txt"]
+    for name in keep:
+        (tmp_path / name).write_text("{}")
+    assert cache.clear() == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(keep)
+
+
+def test_cache_key_depends_on_params_and_settings():
+    base = cache.cache_key("t", CpiParams(), {"iters": 200})
+    assert base == cache.cache_key("t", CpiParams(), {"iters": 200})
+    assert base != cache.cache_key("t", CpiParams(target_cpi=201.0), {"iters": 200})
+    assert base != cache.cache_key("t", CpiParams(), {"iters": 100})
+    assert base != cache.cache_key("u", CpiParams(), {"iters": 200})
+
+
+def test_disabled_cache_always_recomputes(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(cache, "_enabled", False)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 1.0
+
+    cache.cached_reference("t", CpiParams(), {}, compute)
+    cache.cached_reference("t", CpiParams(), {}, compute)
+    assert len(calls) == 2
+    assert not list(tmp_path.iterdir())
+
+
+def test_corrupt_entry_is_a_miss(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    key = cache.cache_key("t", CpiParams(), {})
+    (tmp_path / f"{key}.json").write_text("{not json", encoding="utf-8")
+    assert cache.cached_reference("t", CpiParams(), {}, lambda: 2.0) == 2.0
+    assert cache.cached_reference("t", CpiParams(), {}, lambda: 3.0) == 2.0
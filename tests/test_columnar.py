@@ -0,0 +1,87 @@
+import math
+import random
+from pathlib import Path
+
+import pytest
+
+from econ_math_portfolio.columnar import (
+    ABOVE_TOLERANCE,
+    MISSING_EXPLANATION,
+    OUT_OF_BOUNDS,
+    UNKNOWN_TASK,
+    score_columns,
+    word_count,
+)
+from econ_math_portfolio.scoring import load_compiled_rubric, score_submission
+
+RUBRIC = load_compiled_rubric(Path("rubrics/rubric.json"))
+EXPECTED = {"cpi_target_discount": 0.2619047619047619, "hjb_discount_threshold": 0.0575}
+
+
+def _rows(n, seed=3):
+    rng = random.Random(seed)
+    explanations = [None, "", "   ", "short one", "one two three four five six seven eight"]
+    rows = []
+    for _ in range(n):
+        task = rng.choice([*EXPECTED, "no_such_task"])
+        answer = rng.choice(
+            [EXPECTED.get(task, 1.0), 0.5, 2.0, -1.0, math.nan, "junk", EXPECTED.get(task, 1.0)]
+        )
+        rows.append((task, answer, rng.choice(explanations)))
+    return rows
+
+
+def _rubric_requiring_explanations():
+    raw = {
+        "scoring": {
+            "components": {"format": 0.2, "numeric_correctness": 0.7, "reasoning_quality": 0.1}
+        },
+        "tasks": {
+            "cpi_target_discount": {"tolerance": 1e-5, "bounds": {"min": 0.0, "max": 1.0}},
+            "hjb_discount_threshold": {"tolerance": 1e-6, "require_explanation": True},
+        },
+    }
+    return raw
+
+
+@pytest.mark.parametrize("backend", ["numpy", "python"])
+@pytest.mark.parametrize("rubric", [RUBRIC, _rubric_requiring_explanations()])
+def test_score_columns_matches_score_submission(backend, rubric):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    rows = _rows(400)
+    out = score_columns(
+        [t for t, _, _ in rows],
+        [a if isinstance(a, float) else math.nan for _, a, _ in rows],
+        [word_count(e) for _, _, e in rows],
+        format_ok=[isinstance(a, float) for _, a, _ in rows],
+        rubric=rubric,
+        expected_for=EXPECTED.__getitem__,
+        backend=backend,
+    )
+    assert len(out) == len(rows)
+    for i, (task, answer, explanation) in enumerate(rows):
+        single = score_submission(
+            task_id=task,
+            answer=answer,
+            explanation=explanation,
+            expected=EXPECTED.get(task, math.nan),
+            rubric=rubric,
+        )
+        assert out.breakdown(i) == single
+
+
+def test_score_columns_accepts_structured_arrays_and_sets_reason_bits():
+    np = pytest.importorskip("numpy")
+    records = np.array(
+        [
+            ("cpi_target_discount", 0.2619047619047619, 9),
+            ("cpi_target_discount", 1.5, 0),
+            ("nope", 0.0, 0),
+        ],
+        dtype=[("task_id", "U32"), ("answer", "f8"), ("words", "i4")],
+    )
+    out = score_columns(records=records, rubric=RUBRIC, expected_for=EXPECTED.__getitem__)
+    assert out.total.tolist() == [1.0, 0.2, 0.0]
+    assert out.reasons.tolist() == [0, OUT_OF_BOUNDS | ABOVE_TOLERANCE, UNKNOWN_TASK]
+    assert not (out.reasons & MISSING_EXPLANATION).any()
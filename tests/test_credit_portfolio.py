@@ -0,0 +1,33 @@
+import pytest
+
+from econ_math_portfolio.models.credit_portfolio import (
+    PortfolioParams,
+    granular_portfolio,
+    one_factor_portfolio,
+    simulate_portfolio_risk,
+)
+from econ_math_portfolio.models.credit_var_quantile import CreditParams, var_analytic
+
+
+def test_portfolio_converges_to_granular_var_analytic():
+    pytest.importorskip("numpy")
+    p = CreditParams()
+    risk = simulate_portfolio_risk(granular_portfolio(p, 500), n_scenarios=40_000, seed=3)
+    # granularity adjustment + MC noise; the infinitely granular VaR is the limit
+    assert abs(risk.var - var_analytic(p)) < 1.0
+    assert risk.es >= risk.var
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_portfolio_result_independent_of_worker_count(backend):
+    pf = one_factor_portfolio([1.0, 2.0, 3.0] * 10, [0.01, 0.02, 0.05] * 10, [0.6] * 30, 0.3)
+    kw = {"n_scenarios": 2_000, "seed": 5, "chunk_scenarios": 300, "backend": backend}
+    serial = simulate_portfolio_risk(pf, **kw)
+    assert simulate_portfolio_risk(pf, workers=2, **kw) == serial
+
+
+def test_portfolio_rejects_invalid_obligors():
+    with pytest.raises(ValueError):
+        PortfolioParams(exposure=(1.0,), pd=(1.5,), lgd=(0.5,), loadings=((0.3,),))
+    with pytest.raises(ValueError):
+        PortfolioParams(exposure=(1.0,), pd=(0.1,), lgd=(0.5,), loadings=((0.8, 0.8),))
@@ -0,0 +1,44 @@
+from dataclasses import replace
+
+import pytest
+
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.models.credit_tail import es_quadrature, tail_curve
+from econ_math_portfolio.models.credit_var_quantile import (
+    CreditParams,
+    var_analytic,
+    var_mc_estimate,
+)
+
+ALPHAS = (0.999, 0.9997, 0.9999)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_curve_matches_analytic_var_and_es_within_standard_errors(backend):
+    p = CreditParams()
+    curve = tail_curve(p, ALPHAS, n_paths=20_000, seed=3, backend=backend)
+    assert [pt.alpha for pt in curve.points] == list(ALPHAS)
+    for pt in curve.points:
+        assert abs(pt.var - var_analytic(replace(p, alpha=pt.alpha))) < 5 * pt.var_std_error
+        assert abs(pt.es - es_quadrature(p, pt.alpha)) < 5 * pt.es_std_error
+        assert pt.es > pt.var
+    assert [pt.n_tail for pt in curve.points] == sorted(
+        (pt.n_tail for pt in curve.points), reverse=True
+    )
+
+
+def test_one_simulation_serves_every_level_with_a_smaller_error_than_plain_sampling():
+    p = CreditParams()
+    before = METRICS.snapshot()["counters"].get("mc_paths", 0)
+    curve = tail_curve(p, ALPHAS, n_paths=20_000, seed=1, backend="python")
+    assert METRICS.snapshot()["counters"]["mc_paths"] - before == 20_000
+    plain = var_mc_estimate(p, n_paths=20_000, seed=1)
+    assert curve.at(0.999).var_std_error < plain.std_error / 5
+    assert curve.at(0.999).n_tail > 100 * 20  # vs ~20 tail paths with plain sampling
+
+
+def test_rejects_bad_levels():
+    with pytest.raises(ValueError):
+        tail_curve(CreditParams(), [])
+    with pytest.raises(ValueError):
+        tail_curve(CreditParams(), [0.5, 1.0])
@@ -1,10 +1,23 @@
 import math
+import random
+from statistics import NormalDist
 
 import pytest
 
 from econ_math_portfolio.models.contract_stochastic_income import ContractParams, solve_c_high
 from econ_math_portfolio.models.cpi_target_discount import CpiParams, cpi, solve_t
-from econ_math_portfolio.models.credit_var_quantile import CreditParams, var_analytic, var_mc
+from econ_math_portfolio.models.credit_var_quantile import (
+    CreditParams,
+    _bits_to_uniform,
+    _loss_at_uniform,
+    _var_from_factors_numpy,
+    counter_uniforms,
+    var_analytic,
+    var_mc,
+    var_mc_adaptive,
+    var_mc_estimate,
+    var_with_sanity_check,
+)
 from econ_math_portfolio.models.hjb_discount_threshold import F, HjbParams, rho_critical
 
 
@@ -45,3 +58,163 @@ def test_credit_var_mc_sanity_close_to_analytic():
     assert math.isfinite(mc)
     # toy model, allow some noise but should be in same ballpark
     assert abs(mc - a) < 0.5
+
+
+def test_credit_var_mc_numpy_kernel_matches_python_on_same_draws():
+    # Equivalence: feed the numpy kernel the exact factors the pure-Python loop draws.
+    np = pytest.importorskip("numpy")
+    p = CreditParams()
+    n, seed = 20_000, 7
+    nd = NormalDist()
+    rnd = random.Random(seed)
+    z = np.array([nd.inv_cdf(rnd.random()) for _ in range(n)])
+    assert _var_from_factors_numpy(np, p, z) == var_mc(p, n_paths=n, seed=seed)
+
+
+def test_credit_var_mc_numpy_backend_is_seed_reproducible():
+    pytest.importorskip("numpy")
+    p = CreditParams()
+    a = var_mc(p, n_paths=200_000, seed=11, backend="numpy")
+    assert a == var_mc(p, n_paths=200_000, seed=11, backend="numpy")
+    assert abs(a - var_analytic(p)) < 0.5
+
+
+def test_credit_var_mc_numpy_backend_falls_back_without_numpy(monkeypatch):
+    import econ_math_portfolio.models.credit_var_quantile as cvq
+
+    monkeypatch.setattr(cvq, "numpy_or_none", lambda: None)
+    p = CreditParams()
+    assert cvq.var_mc(p, n_paths=5_000, backend="numpy") == cvq.var_mc(p, n_paths=5_000)
+
+
+def test_credit_var_mc_estimate_plain_matches_var_mc():
+    p = CreditParams()
+    est = var_mc_estimate(p, n_paths=20_000, seed=3)
+    assert est.value == var_mc(p, n_paths=20_000, seed=3)
+    assert est.std_error > 0
+
+
+@pytest.mark.parametrize("sampling", ["stratified", "sobol"])
+def test_credit_var_mc_variance_reduction_shrinks_standard_error(sampling):
+    p = CreditParams()
+    plain = var_mc_estimate(p, n_paths=32_768, seed=5)
+    est = var_mc_estimate(p, n_paths=32_768, seed=5, sampling=sampling)
+    assert est.std_error * 10 < plain.std_error
+    assert abs(est.value - var_analytic(p)) < 0.2
+
+
+@pytest.mark.parametrize("sampling", ["stratified", "sobol"])
+def test_credit_var_mc_stratified_error_accounts_for_the_stratum_offset(sampling):
+    pytest.importorskip("numpy")
+    p = CreditParams()
+    ests = [
+        var_mc_estimate(p, n_paths=32_768, seed=s, sampling=sampling, backend="numpy")
+        for s in range(100)
+    ]
+    errors = [e.value - var_analytic(p) for e in ests]
+    mean_error = sum(errors) / len(errors)
+    rmse = math.sqrt(sum(x * x for x in errors) / len(errors))
+    assert abs(mean_error - ests[0].bias) < 0.015  # ~3 sd of the mean over 100 seeds
+    assert 0.7 < ests[0].std_error / rmse < 1.4
+
+
+def test_credit_var_mc_sobol_needs_power_of_two_paths():
+    with pytest.raises(ValueError, match="power-of-two"):
+        var_mc_estimate(CreditParams(), n_paths=50_000, sampling="sobol")
+
+
+def test_credit_var_mc_rejects_unknown_sampling():
+    with pytest.raises(ValueError):
+        var_mc(CreditParams(), n_paths=100, sampling="lhs")
+
+
+@pytest.mark.parametrize("alpha", [0.999, 0.02])
+def test_credit_var_mc_streaming_matches_full_sort(alpha):
+    p = CreditParams(alpha=alpha)
+    assert var_mc(p, n_paths=30_001, seed=9, streaming=True) == var_mc(p, n_paths=30_001, seed=9)
+
+
+def test_credit_var_mc_numpy_streaming_is_chunk_size_invariant():
+    pytest.importorskip("numpy")
+    p = CreditParams()
+    full = var_mc(p, n_paths=100_000, seed=9, backend="numpy")
+    for chunk in (1_000, 33_333):
+        kw = {"backend": "numpy", "streaming": True, "chunk_size": chunk}
+        assert var_mc(p, n_paths=100_000, seed=9, **kw) == full
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_credit_var_mc_adaptive_stops_once_the_interval_is_narrow(backend):
+    p = CreditParams()
+    wide = var_mc_adaptive(p, target_width=2.5, batch_paths=5_000, backend=backend)
+    narrow = var_mc_adaptive(p, target_width=0.5, batch_paths=5_000, backend=backend)
+    assert wide.converged and narrow.converged
+    assert wide.width <= 2.5 and narrow.width <= 0.5
+    assert wide.n_paths < 50_000 < narrow.n_paths  # fewer or more paths than a fixed budget
+    assert narrow.ci_low <= var_analytic(p) <= narrow.ci_high
+    capped = var_mc_adaptive(p, target_width=1e-6, batch_paths=1_000, max_paths=3_000)
+    assert capped.n_paths == 3_000 and not capped.converged
+
+
+def test_credit_var_mc_adaptive_follows_the_var_mc_stream():
+    p = CreditParams()
+    est = var_mc_adaptive(p, target_width=2.0, seed=4, batch_paths=2_000)
+    assert est.value == var_mc(p, n_paths=est.n_paths, seed=4)
+
+
+def test_credit_counter_stream_draws_depend_only_on_seed_and_path():
+    whole = counter_uniforms(5, 0, 1_000)
+    assert counter_uniforms(5, 400, 3) == whole[400:403]
+    assert counter_uniforms(6, 0, 1_000) != whole
+    assert all(0.0 < u < 1.0 for u in whole)
+    np = pytest.importorskip("numpy")
+    assert counter_uniforms(5, 0, 1_000, backend="numpy").tolist() == whole
+    assert isinstance(counter_uniforms(5, 0, 10, backend="numpy"), np.ndarray)
+
+
+def test_credit_counter_stream_extreme_bits_stay_inside_the_unit_interval():
+    lo, hi = _bits_to_uniform(0), _bits_to_uniform(2**64 - 1)
+    assert lo == 2.0**-53 and hi == 1.0 - 2.0**-53
+    assert _bits_to_uniform(2**63) == 0.5 + 2.0**-53  # the +0.5 offset survives near 1
+    assert math.isfinite(_loss_at_uniform(CreditParams(), hi))
+
+
+@pytest.mark.parametrize("alpha", [0.999, 0.02])
+def test_credit_var_mc_counter_stream_is_chunk_and_worker_invariant(alpha):
+    p = CreditParams(alpha=alpha)
+    serial = var_mc(p, n_paths=40_001, seed=9, stream="counter")
+    for chunk, workers in ((1_000, 1), (7_777, 1), (10_000, 2)):
+        kw = {"stream": "counter", "chunk_size": chunk, "workers": workers}
+        assert var_mc(p, n_paths=40_001, seed=9, **kw) == serial
+    assert var_mc(p, n_paths=40_001, seed=9, stream="counter", backend="numpy") == serial
+    if alpha == 0.999:
+        assert abs(serial - var_analytic(p)) < 1.0
+
+
+def test_credit_var_mc_counter_stream_rejects_bad_options():
+    with pytest.raises(ValueError):
+        var_mc(CreditParams(), n_paths=100, stream="philox")
+    with pytest.raises(ValueError):
+        var_mc(CreditParams(), n_paths=100, workers=2)  # the sequential stream cannot split
+    with pytest.raises(ValueError):
+        var_mc(CreditParams(), n_paths=100, stream="counter", sampling="sobol")
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_credit_var_mc_adaptive_counter_stream_matches_var_mc(backend):
+    p = CreditParams()
+    kw = {"seed": 4, "stream": "counter", "backend": backend}
+    est = var_mc_adaptive(p, target_width=2.0, batch_paths=2_000, **kw)
+    assert est.value == var_mc(p, n_paths=est.n_paths, seed=4, stream="counter")
+
+
+def test_credit_sanity_check_reports_paths_used():
+    p = CreditParams()
+    fixed, adaptive = {}, {}
+    assert var_with_sanity_check(p, mc_paths=20_000, stats=fixed) == var_analytic(p)
+    assert fixed["mc_paths"] == 20_000
+    var_with_sanity_check(p, mc_paths=5_000, target_width=2.5, stats=adaptive)
+    assert adaptive["converged"] and adaptive["mc_paths"] % 5_000 == 0
+    assert adaptive["ci_high"] - adaptive["ci_low"] <= 2.5
+    with pytest.raises(RuntimeError):
+        var_with_sanity_check(p, mc_paths=5_000, target_width=2.5, max_gap=1e-9)
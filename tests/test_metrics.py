@@ -0,0 +1,30 @@
+import json
+import pstats
+
+from econ_math_portfolio.cli import main
+from econ_math_portfolio.metrics import Metrics
+
+
+def test_metrics_snapshots_merge_additively():
+    a, b = Metrics(), Metrics()
+    with a.phase("scoring"):
+        pass
+    a.incr("mc_paths", 10)
+    b.incr("mc_paths", 5)
+    b.incr("cache_hits")
+    total = Metrics()
+    total.merge(a.snapshot())
+    total.merge(b.drain())
+    assert total.counters == {"mc_paths": 15, "cache_hits": 1}
+    assert "scoring" in total.timers
+    assert b.snapshot() == {"timers": {}, "counters": {}}
+
+
+def test_cli_metrics_and_profile(tmp_path, capsys):
+    prof = tmp_path / "run.pstats"
+    argv = ["--json", "--no-cache", "--profile", str(prof)]  # --json alone reports metrics
+    assert main([*argv, "reference", "cpi_target_discount"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["metrics"]["counters"]["closed_form_solves"] >= 1
+    assert "reference_compute" in out["metrics"]["timers"]
+    assert pstats.Stats(str(prof)).total_calls > 0
@@ -1,9 +1,15 @@
+import math
+
+import pytest
+
+from econ_math_portfolio.metrics import METRICS
 from econ_math_portfolio.models.contract_stochastic_income import (
     ContractParams,
     lifetime_utility,
     solve_c_high,
+    solve_c_high_batch,
 )
-from econ_math_portfolio.models.cpi_target_discount import CpiParams, cpi, solve_t
+from econ_math_portfolio.models.cpi_target_discount import CpiParams, cpi, solve_t, solve_t_batch
 
 
 def test_cpi_bisection_hits_target():
@@ -18,3 +24,38 @@ def test_contract_solver_hits_target_or_constraint_binds():
     v = lifetime_utility(p.delta, p.c_low, c_high)
     assert v >= p.V0 - 1e-6
     assert c_high >= p.autarky_high
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_cpi_batch_matches_scalar_and_masks_unbracketed(backend):
+    targets = [150.0, 190.0, 200.0, 205.0]
+    res = solve_t_batch(target_cpi=targets, backend=backend)
+    assert [bool(x) for x in res.ok] == [False, True, True, True]
+    assert math.isnan(res.values[0])
+    for t, v in zip(targets[1:], list(res.values)[1:], strict=True):
+        assert abs(v - solve_t(CpiParams(target_cpi=t))) < 1e-12
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_cpi_batch_masks_degenerate_discount_coeff(backend):
+    res = solve_t_batch(discount_coeff=[0.0, 0.21], backend=backend)
+    assert [bool(x) for x in res.ok] == [False, True]
+    assert math.isnan(res.values[0])
+    assert abs(res.values[1] - solve_t(CpiParams())) < 1e-12
+    with pytest.raises(ValueError):
+        solve_t(CpiParams(discount_coeff=0.0))
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+@pytest.mark.parametrize("method", ["closed_form", "bisect"])
+def test_contract_batch_keeps_autarky_clamp(backend, method):
+    METRICS.drain()
+    res = solve_c_high_batch(
+        V0=[3.0, 3.0, 1e6], autarky_high=[1.1, 2.5, 1.1], method=method, backend=backend
+    )
+    counters = METRICS.drain()["counters"]
+    assert [bool(x) for x in res.ok] == [True, True, False]
+    assert abs(res.values[0] - solve_c_high(ContractParams())) < 1e-8
+    assert res.values[1] == 2.5
+    if method == "bisect":
+        assert "closed_form_solves" not in counters
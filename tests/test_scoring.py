@@ -1,7 +1,20 @@
+import copy
 import importlib
+import io
 from pathlib import Path
 
-from econ_math_portfolio.scoring import load_rubric, score_submission
+import pytest
+
+from econ_math_portfolio.scoring import (
+    CompiledRubric,
+    compile_rubric,
+    iter_submissions,
+    load_compiled_rubric,
+    load_rubric,
+    score_many,
+    score_submission,
+    to_json_dict,
+)
 
 
 def test_scoring_correct_answer_scores_high(tmp_path):
@@ -42,3 +55,74 @@ def test_bounds_note_does_not_crash():
     )
     # out of bounds should not get full numeric credit
     assert sb.total < 1.0
+
+
+def test_score_many_matches_single_scoring_and_loads_expected_once():
+    rubric = load_rubric(Path("rubrics/rubric.json"))
+    v = importlib.import_module("validators.contract_stochastic_income")
+    calls = []
+
+    def expected_for(task_id):
+        calls.append(task_id)
+        return float(v.EXPECTED)
+
+    subs = [
+        {"task_id": "contract_stochastic_income", "answer": v.EXPECTED},
+        {"task_id": "contract_stochastic_income", "answer": "nope"},
+        {"task_id": "no_such_task", "answer": 1.0},
+        None,
+    ]
+    out = list(score_many(subs, rubric=rubric, expected_for=expected_for))
+
+    assert calls == ["contract_stochastic_income"]
+    assert [r["index"] for r in out] == [0, 1, 2, 3]
+    single = score_submission(
+        task_id="contract_stochastic_income",
+        answer="nope",
+        explanation=None,
+        expected=float(v.EXPECTED),
+        rubric=rubric,
+    )
+    assert out[1]["score"] == to_json_dict(single)
+    assert out[0]["score"]["numeric_score"] == 1.0
+    assert out[2]["score"]["reasons"] == ["unknown task_id: no_such_task"]
+    assert out[3]["score"]["total"] == 0.0
+
+
+def test_iter_submissions_skips_blank_and_flags_malformed_lines():
+    lines = io.StringIO('{"task_id": "a"}\n\nnot json\n')
+    assert list(iter_submissions(lines)) == [{"task_id": "a"}, None]
+
+
+def test_compiled_rubric_scores_like_the_raw_dict():
+    raw = load_rubric(Path("rubrics/rubric.json"))
+    compiled = load_compiled_rubric(Path("rubrics/rubric.json"))
+    assert isinstance(compiled, CompiledRubric)
+    assert compiled.tasks["cpi_target_discount"].bounds == (0.0, 1.0)
+    cases = [
+        ("cpi_target_discount", 2.0, ""),
+        ("cpi_target_discount", 0.2619047619047619, "one two three four five six seven eight"),
+        ("hjb_discount_threshold", "x", None),
+        ("no_such_task", 1.0, None),
+    ]
+    for task_id, answer, explanation in cases:
+        kw = dict(task_id=task_id, answer=answer, explanation=explanation, expected=0.2619)
+        assert score_submission(**kw, rubric=compiled) == score_submission(**kw, rubric=raw)
+
+
+@pytest.mark.parametrize(
+    "mutate, field",
+    [
+        (lambda r: r["scoring"]["components"].pop("format"), "scoring.components.format"),
+        (lambda r: r["scoring"]["components"].update(format="0.2"), "scoring.components.format"),
+        (lambda r: r["tasks"]["cpi_target_discount"].update(tolerance=-1), "tolerance"),
+        (lambda r: r["tasks"]["cpi_target_discount"]["bounds"].update(min=2.0), "bounds.min"),
+        (lambda r: r["tasks"]["hjb_discount_threshold"].update(expected_format="int"), "format"),
+        (lambda r: r.update(tasks=[]), "tasks"),
+    ],
+)
+def test_compile_rubric_rejects_malformed_rubrics(mutate, field):
+    raw = copy.deepcopy(load_rubric(Path("rubrics/rubric.json")))
+    mutate(raw)
+    with pytest.raises(ValueError, match=field):
+        compile_rubric(raw)
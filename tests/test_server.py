@@ -0,0 +1,80 @@
+import asyncio
+import json
+from pathlib import Path
+
+from econ_math_portfolio.server import GradingServer
+
+RUBRIC = Path(__file__).resolve().parents[1] / "rubrics" / "rubric.json"
+CPI = 0.2619047619047619
+
+
+async def _with_server(scenario, **start):
+    server = GradingServer(RUBRIC, grace=5.0)
+    address = await server.start(**start)
+    serving = asyncio.ensure_future(server.serve_until_stopped())
+    try:
+        return await scenario(address)
+    finally:
+        server.stop()
+        await serving
+
+
+def test_unix_socket_pipelines_requests_and_answers_in_order(tmp_path):
+    sock = str(tmp_path / "grader.sock")
+    requests = [
+        {"id": 1, "op": "score", "body": {"task_id": "cpi_target_discount", "answer": CPI}},
+        {"id": 2, "op": "validate", "body": {"task_id": "hjb_discount_threshold", "answer": 0}},
+        {"id": 3, "op": "nope"},
+        {"id": 4, "op": "validate-batch", "body": [{"task_id": "x", "answer": 1}, 5]},
+        {"id": 5, "op": "reference", "body": {"task_id": "cpi_target_discount"}},
+    ]
+
+    async def scenario(address):
+        assert address == f"unix:{sock}"
+        reader, writer = await asyncio.open_unix_connection(sock)
+        # Everything is written before any response is read.
+        writer.write(b"".join(json.dumps(r).encode() + b"\n" for r in requests) + b"{bad\n")
+        await writer.drain()
+        out = [json.loads(await reader.readline()) for _ in range(len(requests) + 1)]
+        writer.close()
+        return out
+
+    out = asyncio.run(_with_server(scenario, unix=sock))
+    assert [r["id"] for r in out] == [1, 2, 3, 4, 5, None]
+    assert [r["status"] for r in out] == [200, 200, 404, 200, 200, 400]
+    assert out[0]["body"]["score"]["numeric_score"] == 1.0
+    assert out[1]["body"]["ok"] is False
+    assert [r["error"] for r in out[3]["body"]["results"]] == [
+        "unknown task_id",
+        "not a JSON object",
+    ]
+    assert abs(out[4]["body"]["reference"] - CPI) < 1e-12
+    assert not Path(sock).exists()  # removed on shutdown
+
+
+def test_http_keep_alive_batch_and_shutdown_endpoint():
+    batch = json.dumps([{"task_id": "cpi_target_discount", "answer": CPI}, "junk"]).encode()
+
+    async def scenario(address):
+        host, port = address.removeprefix("http://").rsplit(":", 1)
+        reader, writer = await asyncio.open_connection(host, int(port))
+        writer.write(
+            b"GET /reference/cpi_target_discount HTTP/1.1\r\nHost: x\r\n\r\n"
+            b"POST /score-batch HTTP/1.1\r\nHost: x\r\n"
+            + f"Content-Length: {len(batch)}\r\n\r\n".encode()
+            + batch
+            + b"POST /shutdown HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+        )
+        await writer.drain()
+        raw = await reader.read()  # server closes after the last response
+        writer.close()
+        return raw
+
+    raw = asyncio.run(_with_server(scenario, port=0))
+    chunks = raw.split(b"HTTP/1.1 ")[1:]
+    assert [c.split(b"\r\n", 1)[0] for c in chunks] == [b"200 OK"] * 3
+    bodies = [json.loads(c.split(b"\r\n\r\n", 1)[1]) for c in chunks]
+    assert abs(bodies[0]["reference"] - CPI) < 1e-12
+    assert bodies[1]["results"][0]["score"]["numeric_score"] == 1.0
+    assert bodies[1]["results"][1]["score"]["reasons"] == ["submission is not a JSON object"]
+    assert bodies[2] == {"status": "shutting down"}
@@ -0,0 +1,52 @@
+import math
+
+import pytest
+
+from econ_math_portfolio import solvers
+from econ_math_portfolio.models.contract_stochastic_income import ContractParams, c_high_root
+from econ_math_portfolio.models.cpi_target_discount import CpiParams, t_root
+from econ_math_portfolio.solvers import METHODS, find_root
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_methods_agree_on_smooth_root(method):
+    res = find_root(math.cos, 0.0, 3.0, method=method, df=lambda x: -math.sin(x))
+    assert res.converged
+    assert abs(res.root - math.pi / 2) < 1e-10
+    assert res.method == method
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_methods_raise_if_not_bracketed(method):
+    with pytest.raises(ValueError):
+        find_root(lambda x: x * x + 1.0, -1.0, 1.0, method=method, df=lambda x: 2 * x)
+
+
+def test_newton_falls_back_to_brent_without_derivative():
+    assert find_root(lambda x: x - 0.3, 0.0, 1.0, method="newton").method == "brent"
+
+
+@pytest.mark.parametrize("method", ["brent", "newton"])
+def test_model_roots_need_far_fewer_evaluations_than_bisection(method):
+    for root_fn, params in ((c_high_root, ContractParams()), (t_root, CpiParams())):
+        slow = root_fn(params, method="bisect")
+        fast = root_fn(params, method=method)
+        assert abs(fast.root - slow.root) < 1e-9
+        assert fast.evaluations + fast.derivative_evaluations < slow.evaluations / 2
+
+
+def test_closed_forms_match_iterative_solvers():
+    contract, cpi_p = ContractParams(), CpiParams()
+    assert abs(c_high_root(contract).root - c_high_root(contract, method="newton").root) < 1e-12
+    assert abs(t_root(cpi_p).root - t_root(cpi_p, method="bisect").root) < 1e-12
+    assert c_high_root(contract).iterations == 0
+
+
+def test_verify_mode_cross_checks_closed_form(monkeypatch):
+    import econ_math_portfolio.models.contract_stochastic_income as csi
+
+    monkeypatch.setattr(solvers, "_verify", True)
+    assert c_high_root(ContractParams()).method == "closed_form"
+    monkeypatch.setattr(csi, "c_high_closed_form", lambda p: 1.5)
+    with pytest.raises(RuntimeError):
+        c_high_root(ContractParams())
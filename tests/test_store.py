@@ -0,0 +1,88 @@
+import copy
+import json
+from pathlib import Path
+
+from econ_math_portfolio.cli import main
+from econ_math_portfolio.scoring import load_rubric, score_many
+from econ_math_portfolio.store import ResultStore, rescore, score_many_stored
+
+RAW = load_rubric(Path("rubrics/rubric.json"))
+EXPECTED = {"cpi_target_discount": 0.2619047619047619, "hjb_discount_threshold": 0.0575}
+SUBS = [
+    {"task_id": "cpi_target_discount", "answer": 0.26190},
+    {"task_id": "cpi_target_discount", "answer": 0.2619047619047619},
+    {"task_id": "hjb_discount_threshold", "answer": 0.0575, "explanation": "x"},
+    {"task_id": "nope", "answer": 1.0},
+    None,
+]
+
+
+def test_stored_scoring_matches_score_many_and_reuses_results(tmp_path):
+    plain = list(score_many(SUBS, rubric=RAW, expected_for=EXPECTED.__getitem__))
+    with ResultStore(tmp_path / "r.sqlite") as store:
+        first = list(
+            score_many_stored(SUBS, rubric=RAW, expected_for=EXPECTED.__getitem__, store=store)
+        )
+        assert len(store) == 4  # non-objects are not stored
+
+    calls = []
+
+    def expected_for(task_id):
+        calls.append(task_id)
+        return EXPECTED[task_id]
+
+    with ResultStore(tmp_path / "r.sqlite") as store:
+        second = list(score_many_stored(SUBS, rubric=RAW, expected_for=expected_for, store=store))
+        assert len(store) == 4
+    assert first == second == plain
+    assert sorted(calls) == ["cpi_target_discount", "hjb_discount_threshold"]
+
+
+def test_rescore_recomputes_only_the_edited_task_and_reports_diffs(tmp_path):
+    new = copy.deepcopy(RAW)
+    new["tasks"]["cpi_target_discount"]["tolerance"] = 1e-9
+    stats = {}
+    with ResultStore(tmp_path / "r.sqlite") as store:
+        list(score_many_stored(SUBS, rubric=RAW, expected_for=EXPECTED.__getitem__, store=store))
+        diffs = list(
+            rescore(
+                SUBS,
+                old_rubric=RAW,
+                rubric=new,
+                expected_for=EXPECTED.__getitem__,
+                store=store,
+                stats=stats,
+            )
+        )
+    assert stats == {"records": 5, "reused": 2, "rescored": 3, "changed": 1}
+    assert [d["index"] for d in diffs] == [0]
+    assert diffs[0]["old"]["numeric_score"] == 1.0
+    assert diffs[0]["new"]["numeric_score"] == 0.0
+
+
+def test_cli_rescore_defaults_to_the_rubric_recorded_by_the_store(tmp_path, capsys):
+    subs = tmp_path / "subs.jsonl"
+    subs.write_text("".join(json.dumps(s) + "\n" for s in SUBS[:3]))
+    db = str(tmp_path / "r.sqlite")
+    assert main(["rescore", str(subs), "--store", db]) == 1  # nothing recorded yet
+
+    assert main(["score-batch", str(subs), "--store", db]) == 0
+    capsys.readouterr()
+    assert main(["rescore", str(subs), "--store", db]) == 0
+    out = capsys.readouterr()
+    assert out.out == ""
+    assert json.loads(out.err)["rescore"] == {
+        "records": 3,
+        "reused": 3,
+        "rescored": 0,
+        "changed": 0,
+    }
+
+    old = copy.deepcopy(RAW)
+    old["scoring"]["components"]["format"] = 0.0
+    old_path = tmp_path / "old_rubric.json"
+    old_path.write_text(json.dumps(old))
+    assert main(["rescore", str(subs), "--store", db, "--since-rubric", str(old_path)]) == 0
+    out = capsys.readouterr()
+    assert [json.loads(line)["index"] for line in out.out.splitlines()] == [0, 1, 2]
+    assert json.loads(out.err)["rescore"]["changed"] == 3
@@ -0,0 +1,68 @@
+import json
+
+from econ_math_portfolio.cli import main
+from econ_math_portfolio.summary import Summary, reason_kind
+
+CPI = 0.2619047619047619
+
+
+def test_reason_kind_drops_per_submission_numbers():
+    assert reason_kind("abs_error=0.5 exceeds tolerance=1e-05") == "abs_error exceeds tolerance"
+    assert reason_kind("answer out of bounds [0.0, 1.0]") == "answer out of bounds"
+    assert reason_kind("unknown task_id: foo") == "unknown task_id"
+    assert reason_kind("missing explanation") == "missing explanation"
+
+
+def test_summary_groups_by_task_and_field():
+    def rec(task, model, total, numeric, reasons=()):
+        score = {
+            "total": total,
+            "format_score": 1.0,
+            "numeric_score": numeric,
+            "reasoning_score": 0.0,
+            "reasons": list(reasons),
+        }
+        return {"task_id": task, "model": model, "score": score}
+
+    s = Summary("model").add_all(
+        [
+            rec("a", "m1", 0.9, 1.0),
+            rec("a", "m1", 0.2, 0.0, ["abs_error=3 exceeds tolerance=1"]),
+            rec("a", "m2", 0.2, 0.0, ["abs_error=4 exceeds tolerance=1"]),
+        ]
+    )
+    out = s.to_json_dict()
+    assert [(g["task_id"], g["model"], g["count"]) for g in out["groups"]] == [
+        ("a", "m1", 2),
+        ("a", "m2", 1),
+    ]
+    assert out["groups"][0]["accuracy"] == 0.5
+    assert abs(out["groups"][0]["mean_total"] - 0.55) < 1e-12
+    assert out["overall"]["reasons"] == {"abs_error exceeds tolerance": 2}
+
+
+def test_inline_summary_matches_summarize_on_batch_output(tmp_path, capsys):
+    subs = tmp_path / "subs.jsonl"
+    records = [
+        {"task_id": "cpi_target_discount", "answer": CPI, "model": "m1"},
+        {"task_id": "cpi_target_discount", "answer": 2.0, "model": "m2"},
+        {"task_id": "hjb_discount_threshold", "answer": "x", "model": "m1"},
+    ] * 3
+    subs.write_text("".join(json.dumps(r) + "\n" for r in records))
+    inline = tmp_path / "summary.json"
+    out = tmp_path / "results.jsonl"
+
+    argv = ["score-batch", str(subs), "--group-by", "model", "--summary", str(inline)]
+    assert main([*argv, "--workers", "2", "--chunk-size", "2"]) == 0
+    out.write_text(capsys.readouterr().out)
+    assert all(json.loads(line)["model"] in ("m1", "m2") for line in out.read_text().splitlines())
+
+    assert main(["summarize", str(out), "--group-by", "model"]) == 0
+    assert json.loads(capsys.readouterr().out) == json.loads(inline.read_text())
+    summary = json.loads(inline.read_text())
+    assert summary["overall"]["count"] == 9
+    assert summary["overall"]["reasons"] == {
+        "abs_error exceeds tolerance": 3,
+        "answer is not a number": 3,
+        "answer out of bounds": 3,
+    }
@@ -1,5 +1,8 @@
 import importlib
+import json
 import math
+import subprocess
+import sys
 
 import pytest
 
@@ -28,3 +31,95 @@ def test_validator_accepts_expected(task_id):
 def test_validator_rejects_wrong(task_id):
     v = importlib.import_module(f"validators.{task_id}")
     assert v.validate(v.EXPECTED + 100 * v.TOL)["ok"] is False
+
+
+@pytest.mark.parametrize("task_id", TASKS)
+def test_validate_many_matches_validate(task_id):
+    v = importlib.import_module(f"validators.{task_id}")
+    answers = [v.EXPECTED, v.EXPECTED + 0.5 * v.TOL, v.EXPECTED - 100 * v.TOL, float("nan")]
+    res = v.validate_many(answers)
+    assert len(res) == 4 and res.n_ok == 2
+    for i, a in enumerate(answers[:3]):
+        assert res.result(i) == v.validate(a)
+        assert float(res.abs_error[i]) == v.validate(a)["abs_error"]
+    assert not res.ok[3] and math.isnan(res.abs_error[3])
+
+
+@pytest.mark.parametrize("task_id", TASKS)
+def test_validate_many_accepts_any_iterable(task_id):
+    v = importlib.import_module(f"validators.{task_id}")
+    answers = [v.EXPECTED, v.EXPECTED - 100 * v.TOL]
+    for given, n in (
+        (iter(answers), 2),
+        ((a for a in answers), 2),
+        (tuple(answers), 2),
+        ({answers[0]}, 1),
+    ):
+        res = v.validate_many(given)
+        assert len(res) == n and res.n_ok == 1
+        assert res.result(0) == v.validate(v.EXPECTED)
+
+
+@pytest.mark.parametrize("task_id", TASKS)
+def test_expected_is_lazy_and_memoized(task_id):
+    v = importlib.reload(importlib.import_module(f"validators.{task_id}"))
+    assert v.expected.cache_info().currsize == 0
+    assert v.EXPECTED == v.expected()
+    assert v.expected.cache_info().misses == 1
+
+
+def test_registry_matches_validators_problems_and_rubric():
+    from pathlib import Path
+
+    from econ_math_portfolio.tasks import TASKS, task_ids
+
+    root = Path(__file__).resolve().parents[1]
+    on_disk = sorted(p.stem for p in (root / "validators").glob("*.py") if p.stem != "__init__")
+    assert task_ids() == on_disk == sorted(TASKS)
+    rubric = json.loads((root / "rubrics" / "rubric.json").read_text(encoding="utf-8"))
+    for task_id, info in TASKS.items():
+        v = importlib.import_module(info.module)
+        assert v.TASK_ID == task_id
+        assert v.TOL == info.tolerance == rubric["tasks"][task_id]["tolerance"]
+        problem = (root / "problems" / f"{task_id}.md").read_text(encoding="utf-8")
+        assert f"title: {info.title}\n" in problem
+        assert f"difficulty: {info.difficulty}\n" in problem
+
+
+def test_list_does_not_import_scoring_or_validators():
+    code = (
+        "import sys, contextlib, io\n"
+        "from econ_math_portfolio.cli import main\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    main(['list'])\n"
+        "heavy = [m for m in sys.modules if m.startswith('validators') or m in\n"
+        "         ('econ_math_portfolio.scoring', 'econ_math_portfolio.parallel',\n"
+        "          'econ_math_portfolio.cache')]\n"
+        "print(heavy)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_validate_keeps_cache_and_typing_off_the_import_path():
+    # Closed-form references are computed directly: no hashing, no cache file, no typing.
+    code = (
+        "import sys, contextlib, io\n"
+        "from econ_math_portfolio.cli import main\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    for t in ('contract_stochastic_income', 'cpi_target_discount',\n"
+        "              'hjb_discount_threshold'):\n"
+        "        main(['validate', t, '0.5'])\n"
+        "heavy = [m for m in sys.modules if m in\n"
+        "         ('econ_math_portfolio.cache', 'hashlib', 'pathlib', 'typing')]\n"
+        "print(heavy)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_validate_cold_start_stays_close_to_list():
+    from econ_math_portfolio.bench import run_benchmarks
+
+    best = {r.name: r.seconds for r in run_benchmarks(quick=True, select="cli_startup")}
+    assert best["cli_startup[validate]"] < 2.0 * best["cli_startup[list]"]
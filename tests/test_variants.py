@@ -0,0 +1,160 @@
+import importlib
+import json
+from pathlib import Path
+
+import pytest
+
+from econ_math_portfolio.cli import main
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.models.cpi_target_discount import t_closed_form
+from econ_math_portfolio.scoring import load_rubric, score_many, validate_record
+from econ_math_portfolio.tasks import parse_variant
+from econ_math_portfolio.variants import SAMPLERS, generate, variant_params
+
+RUBRIC = load_rubric(Path("rubrics/rubric.json"))
+
+
+def test_variant_ids_parse_and_params_are_a_function_of_the_id():
+    assert parse_variant("cpi_target_discount:7:12") == ("cpi_target_discount", 7, 12)
+    for bad in ("cpi_target_discount:7", "nope:1:2", "cpi_target_discount:-1:2", 3):
+        with pytest.raises(ValueError, match="unknown variant"):
+            parse_variant(bad)
+    a = variant_params("credit_var_quantile:1:5")
+    assert a == variant_params("credit_var_quantile:01:5")
+    assert a != variant_params("credit_var_quantile:1:6")
+
+
+def test_sampled_params_stay_in_the_valid_ranges():
+    for i in range(200):
+        cpi = variant_params(f"cpi_target_discount:0:{i}")
+        assert 0.0 <= t_closed_form(cpi) <= 1.0
+        credit = variant_params(f"credit_var_quantile:0:{i}")
+        assert 0.0 < credit.PD < 1.0 and 0.0 < credit.rho < 1.0
+
+
+@pytest.mark.parametrize("task_id", sorted(SAMPLERS))
+def test_generated_references_match_the_validator(task_id):
+    v = importlib.import_module(f"validators.{task_id}")
+    block = generate(task_id, 3, seed=2, start=10, workers=2)
+    assert len(block["rows"]) == 3 and block["tolerance"] == v.TOL
+    for i, row in enumerate(block["rows"], 10):
+        variant = f"{task_id}:2:{i}"
+        assert list(row[:-1]) == [getattr(variant_params(variant), f) for f in block["fields"]]
+        assert abs(row[-1] - v.expected(variant)) <= 1e-12 * max(1.0, abs(row[-1]))
+        assert v.validate(row[-1], variant)["ok"] is True
+    with pytest.raises(ValueError, match="unknown variant"):
+        v.expected("cpi_target_discount:2:0" if task_id != "cpi_target_discount" else "x:2:0")
+
+
+def test_generate_rejects_negative_seed_and_start(tmp_path, capsys):
+    with pytest.raises(ValueError, match="must be >= 0"):
+        generate("cpi_target_discount", 2, seed=-1)
+    out = str(tmp_path / "v.json")
+    for flag in ("--seed", "--start"):
+        with pytest.raises(SystemExit) as exc:
+            main(["variants", "generate", "cpi_target_discount", flag, "-1", "--out", out])
+        assert exc.value.code == 2
+        assert "must be >= 0" in capsys.readouterr().err
+
+
+def test_manifest_references_are_used_by_validate_and_batch_scoring(tmp_path, capsys):
+    manifest = str(tmp_path / "variants.json")
+    gen = ["variants", "generate", "cpi_target_discount", "--count", "4", "--seed", "9"]
+    assert main([*gen, "--out", manifest]) == 0
+    capsys.readouterr()
+    rows = json.loads(Path(manifest).read_text())["variants"][0]["rows"]
+
+    METRICS.drain()  # counters are process-wide
+    argv = ["--json", "--metrics", "--variants", manifest, "validate", "cpi_target_discount"]
+    assert main([*argv, str(rows[3][-1]), "--variant", "cpi_target_discount:9:3"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["variant"] == "cpi_target_discount:9:3"
+    assert out["metrics"]["counters"]["manifest_hits"] == 1
+
+    subs = tmp_path / "subs.jsonl"
+    records = [
+        {"task_id": "cpi_target_discount", "variant": f"cpi_target_discount:9:{i}", "answer": r[-1]}
+        for i, r in enumerate(rows)
+    ]
+    subs.write_text("".join(json.dumps(r) + "\n" for r in records))
+    assert main(["--variants", manifest, "score-batch", str(subs), "--workers", "2"]) == 0
+    scores = [json.loads(line)["score"] for line in capsys.readouterr().out.splitlines()]
+    assert [s["numeric_score"] for s in scores] == [1.0] * 4
+
+
+def test_score_and_validate_records_check_the_variant_belongs_to_the_task():
+    variant = "hjb_discount_threshold:0:1"
+    expected = {variant: -0.5, "hjb_discount_threshold": -0.6958}
+    subs = [
+        {"task_id": "hjb_discount_threshold", "variant": variant, "answer": -0.5},
+        {"task_id": "hjb_discount_threshold", "answer": -0.5},
+        {"task_id": "cpi_target_discount", "variant": variant, "answer": -0.5},
+    ]
+    scores = [r["score"] for r in score_many(subs, rubric=RUBRIC, expected_for=expected.get)]
+    assert [s["numeric_score"] for s in scores] == [1.0, 0.0, 0.0]
+    assert scores[2]["reasons"] == ["unknown variant: 'hjb_discount_threshold:0:1'"]
+
+    ok = validate_record(subs[0], expected.__getitem__)
+    assert ok["ok"] is True and ok["variant"] == variant
+    assert validate_record(subs[2], expected.__getitem__)["error"].startswith("unknown variant")
+
+
+def test_binary_table_round_trips_and_serves_lookups(tmp_path, capsys):
+    from econ_math_portfolio.variant_table import VariantTable
+
+    manifest, table = tmp_path / "variants.json", tmp_path / "variants.bin"
+    gen = ["variants", "generate", "cpi_target_discount", "hjb_discount_threshold"]
+    assert (
+        main([*gen, "--count", "50", "--seed", "3", "--start", "100", "--out", str(manifest)]) == 0
+    )
+    assert main(["variants", "convert", str(manifest), str(table)]) == 0
+    assert main(["variants", "convert", str(table), str(tmp_path / "back.json")]) == 0
+    capsys.readouterr()
+    assert (tmp_path / "back.json").read_bytes() == manifest.read_bytes()
+
+    blocks = json.loads(manifest.read_text())["variants"]
+    with VariantTable(table) as t:
+        assert len(t) == 100
+        assert t.expected("hjb_discount_threshold", 3, 149) == blocks[1]["rows"][49][-1]
+        assert t.expected("hjb_discount_threshold", 3, 150) is None
+        assert t.expected("hjb_discount_threshold", 4, 120) is None
+        rec = t.lookup("cpi_target_discount", 3, 100)
+        assert rec.tolerance == 1e-5
+        assert list(rec.params.values()) == blocks[0]["rows"][0][:-1]
+        records = t.records("cpi_target_discount", 3)
+        if hasattr(records, "dtype"):
+            assert list(records["index"][:2]) == [100, 101]
+            assert records["expected"][7] == blocks[0]["rows"][7][-1]
+            del records  # a view onto the mapping: release it before close()
+
+    METRICS.drain()  # counters are process-wide
+    argv = ["--json", "--metrics", "--variants", str(table), "validate", "hjb_discount_threshold"]
+    answer = str(blocks[1]["rows"][5][-1])
+    assert main([*argv, answer, "--variant", "hjb_discount_threshold:3:105"]) == 0
+    assert json.loads(capsys.readouterr().out)["metrics"]["counters"]["manifest_hits"] == 1
+
+
+def test_binary_table_closes_its_mapping_on_a_bad_header(tmp_path, monkeypatch, capsys):
+    import mmap
+
+    from econ_math_portfolio import variant_table
+
+    manifest, table = tmp_path / "variants.json", tmp_path / "variants.bin"
+    assert main(["variants", "generate", "cpi_target_discount", "--out", str(manifest)]) == 0
+    assert main(["variants", "convert", str(manifest), str(table)]) == 0
+    capsys.readouterr()
+    data = bytearray(table.read_bytes())
+    size_at = variant_table._FILE_HEADER.size + variant_table._BLOCK_HEADER.size - 4
+    data[size_at : size_at + 4] = (12345).to_bytes(4, "little")
+    table.write_bytes(bytes(data))
+
+    opened, real_mmap = [], mmap.mmap
+
+    def tracking_mmap(*args, **kwargs):
+        opened.append(real_mmap(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(variant_table.mmap, "mmap", tracking_mmap)
+    with pytest.raises(ValueError, match="bad record size"):
+        variant_table.VariantTable(table)
+    assert len(opened) == 1 and opened[0].closed
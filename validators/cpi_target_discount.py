@@ -1,18 +1,55 @@
 from __future__ import annotations
 
-from econ_math_portfolio.models.cpi_target_discount import CpiParams, solve_t
-from econ_math_portfolio.utils.validate import result
+from collections.abc import Iterable, Sequence
+from dataclasses import fields
+from functools import lru_cache
+
+from econ_math_portfolio.metrics import METRICS
+from econ_math_portfolio.models.cpi_target_discount import CpiParams, solve_t, solve_t_batch
+from econ_math_portfolio.tasks import get_task
+from econ_math_portfolio.utils.validate import ManyResult, result, result_many
 
 TASK_ID = "cpi_target_discount"
-TOL = 1e-5
+TOL = get_task(TASK_ID).tolerance
+
+PARAMS = CpiParams()
+SETTINGS = {"lo": 0.0, "hi": 1.0, "iters": 200, "method": "closed_form"}
+
+
+def reference_compute(params: CpiParams = PARAMS) -> float:
+    return solve_t(params, **SETTINGS)
+
+
+def reference_compute_batch(params: Sequence[CpiParams]) -> list:
+    """``reference_compute`` for many parameter sets in one vectorized solve."""
+    columns = {f.name: [getattr(p, f.name) for p in params] for f in fields(CpiParams)}
+    return list(solve_t_batch(**columns, **SETTINGS).values)
+
+
+@lru_cache(maxsize=None)
+def expected(variant: str | None = None) -> float:
+    """Reference answer (of a variant id, if given), memoized per process. The closed form is
+    cheaper than a disk-cache lookup, so the task's own reference is computed directly;
+    variant references come from the variant manifest when one is set, else the disk cache."""
+    if variant is None:
+        with METRICS.phase("reference_compute"):
+            return reference_compute()
+    from econ_math_portfolio.variants import variant_reference
+
+    return variant_reference(TASK_ID, variant, SETTINGS, reference_compute)
 
 
-def reference_compute() -> float:
-    return solve_t(CpiParams())
+def __getattr__(name: str):
+    # ``EXPECTED`` stays available as a module attribute without paying for it at import.
+    if name == "EXPECTED":
+        return expected()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-EXPECTED = reference_compute()
+def validate(answer: float, variant: str | None = None) -> dict:
+    return result(TASK_ID, expected(variant), TOL, float(answer), variant)
 
 
-def validate(answer: float) -> dict:
-    return result(TASK_ID, EXPECTED, TOL, float(answer))
+def validate_many(answers: Iterable[float], variant: str | None = None) -> ManyResult:
+    """``validate`` for many answers: one reference lookup, one vectorized comparison."""
+    return result_many(TASK_ID, expected(variant), TOL, answers, variant)
@@ -1,21 +1,51 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+from functools import lru_cache
+
+from econ_math_portfolio.metrics import METRICS
 from econ_math_portfolio.models.hjb_discount_threshold import (
     HjbParams,
     rho_critical,
 )
-from econ_math_portfolio.utils.validate import result
+from econ_math_portfolio.tasks import get_task
+from econ_math_portfolio.utils.validate import ManyResult, result, result_many
 
 TASK_ID = "hjb_discount_threshold"
-TOL = 1e-6
+TOL = get_task(TASK_ID).tolerance
+
+PARAMS = HjbParams()
+SETTINGS: dict = {}
+
+
+def reference_compute(params: HjbParams = PARAMS) -> float:
+    return rho_critical(params)
+
+
+@lru_cache(maxsize=None)
+def expected(variant: str | None = None) -> float:
+    """Reference answer (of a variant id, if given), memoized per process. The closed form is
+    cheaper than a disk-cache lookup, so the task's own reference is computed directly;
+    variant references come from the variant manifest when one is set, else the disk cache."""
+    if variant is None:
+        with METRICS.phase("reference_compute"):
+            return reference_compute()
+    from econ_math_portfolio.variants import variant_reference
+
+    return variant_reference(TASK_ID, variant, SETTINGS, reference_compute)
 
 
-def reference_compute() -> float:
-    return rho_critical(HjbParams())
+def __getattr__(name: str):
+    # ``EXPECTED`` stays available as a module attribute without paying for it at import.
+    if name == "EXPECTED":
+        return expected()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-EXPECTED = reference_compute()
+def validate(answer: float, variant: str | None = None) -> dict:
+    return result(TASK_ID, expected(variant), TOL, float(answer), variant)
 
 
-def validate(answer: float) -> dict:
-    return result(TASK_ID, EXPECTED, TOL, float(answer))
+def validate_many(answers: Iterable[float], variant: str | None = None) -> ManyResult:
+    """``validate`` for many answers: one reference lookup, one vectorized comparison."""
+    return result_many(TASK_ID, expected(variant), TOL, answers, variant)